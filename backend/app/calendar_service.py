@@ -188,7 +188,7 @@ OVERNIGHT_BASES: Final[dict[str, dict]] = {
 OVERNIGHT_RADIUS_KM: Final[float] = 80.0
 
 # Import place_aliases to resolve event locations to coordinates
-from .place_aliases import PLACE_ALIASES
+from .place_aliases import find_alias
 
 
 def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -219,14 +219,9 @@ def _resolve_location_to_coords(location: str) -> tuple[float, float] | None:
     if not location:
         return None
 
-    location_lower = location.lower().strip()
-
     # Check place aliases for a match (substring matching like location_service)
-    for key, alias in PLACE_ALIASES.items():
-        if key in location_lower:
-            return (alias["lat"], alias["lon"])
-
-    return None
+    alias = find_alias(location.lower().strip())
+    return (alias["lat"], alias["lon"]) if alias else None
 
 
 def get_overnight_base(now: dt.datetime | None = None) -> dict[str, object] | None:
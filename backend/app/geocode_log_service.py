@@ -47,6 +47,9 @@ FILE = DIR / "geocode_log.json"
 
 
 # ── Log Entry Storage ─────────────────────────────────────────────────────
+# Store version, bumped on every save; with FILE it keys the stats cache.
+_seq = 0
+_stats_cache: tuple[tuple[int, Path], dict[str, Any]] | None = None
 
 
 def _load_entries() -> list[dict[str, Any]]:
@@ -62,15 +65,26 @@ def _load_entries() -> list[dict[str, Any]]:
         return []
 
 
+def _json_layout() -> dict[str, Any]:
+    """``json.dumps`` layout: compact, or indented when PUSH_PRETTY is set."""
+    try:
+        from .push_service import PUSH_PRETTY
+    except Exception:
+        PUSH_PRETTY = False
+    return {"indent": 2} if PUSH_PRETTY else {"separators": (",", ":")}
+
+
 def _save_entries(entries: list[dict[str, Any]]) -> None:
     """Save entries to disk."""
+    global _seq
+    _seq += 1
     try:
         data = {
             "entries": entries,
             "max_age_hours": GEOCODE_LOG_MAX_AGE_H,
             "updated_at": dt.datetime.now(UTC).isoformat(),
         }
-        FILE.write_text(json.dumps(data, indent=2, default=str))
+        FILE.write_text(json.dumps(data, **_json_layout(), default=str))
     except Exception as exc:
         LOG.error("[geocode_log] Failed to save: %s", exc)
 
@@ -196,8 +210,23 @@ def get_geocode_entries(
     return entries
 
 
+def store_version() -> tuple[int, Path]:
+    """Key that changes on every save (or when FILE is repointed)."""
+    return (_seq, FILE)
+
+
 def get_geocode_stats() -> dict[str, Any]:
-    """Get statistics about geocode log entries."""
+    """Get statistics about geocode log entries (cached until the next save)."""
+    global _stats_cache
+    key = (_seq, FILE)
+    if _stats_cache is None or _stats_cache[0] != key:
+        _stats_cache = (key, _compute_geocode_stats())
+    stats = _stats_cache[1]
+    return {**stats, "by_type": dict(stats["by_type"])}
+
+
+def _compute_geocode_stats() -> dict[str, Any]:
+    """Scan the stored entries for ``get_geocode_stats``."""
     entries = _load_entries()
 
     if not entries:
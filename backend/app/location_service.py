@@ -29,20 +29,27 @@ from __future__ import annotations
 
 import asyncio
 import datetime as dt
+import functools
 import logging
 import math
+import os
 import re
+import threading
+import time
 import unicodedata
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Final, List, NamedTuple, Optional, Tuple, Union
 
 import httpx
+import orjson
 from dateutil import tz
+from geopy.adapters import RequestsAdapter
 from geopy.extra.rate_limiter import RateLimiter
 from geopy.geocoders import Nominatim
 
 from .api_logging import logged_request_async
 from .arrival_cache import load as load_last, save as save_last
 from .event_service import (
+    LOW_CONFIDENCE_THRESHOLD,
     LOW_IMPORTANCE_THRESHOLD,
     emit_all_results_infeasible,
     emit_flight_detected,
@@ -56,8 +63,8 @@ from .event_service import (
 from .flight_service import get_plane_state
 from .gdelt_service import get_latest_location
 from . import calendar_service as cal
-from .place_aliases import PLACE_ALIASES
-from .geocode_log_service import add_geocode_entry
+from .place_aliases import find_alias
+from .geocode_log_service import DIR as GEOCODE_DIR, add_geocode_entry
 
 # ── Constants ─────────────────────────────────────────────────────────────
 from .constants import USER_AGENT
@@ -74,9 +81,16 @@ TFR_ENABLED = False  # DISABLED - FAA API broken (returns HTML SPA)
 TFR_JSON_URL = "https://tfr.faa.gov/tfr3/export/json"
 VIP_RE = re.compile(r"VIP", re.I)
 SECURITY_RE = re.compile(r"SECURITY", re.I)
-COORD_RE = re.compile(r"([NS]\d+\.\d+),\s*([EW\-]?\d+\.\d+)")
+# Hemisphere letters are captured apart from the digits so the parser can
+# branch on them and hand the numbers straight to float().
+COORD_RE = re.compile(r"([NS])(\d+\.\d+),\s*([EW\-]?)(\d+\.\d+)")
 
 R_EARTH_KM = 6_371.0
+_EARTH_DIAMETER_KM = 2 * R_EARTH_KM
+_DEG = math.pi / 180
+_HALF_DEG = _DEG / 2
+COORDS_CACHE_S = 5  # repeat polls within this window reuse one resolve
+TFR_RADIUS_KM = 55.0  # plane within this distance of a TFR centre → confirmed
 CAL_BASE_CONF = 70
 CAL_MIN_CONF = 30
 CAL_WINDOW_H = 72.0  # hours
@@ -90,21 +104,28 @@ TRANSLATE = str.maketrans({"\u00a0": " ", "\u2011": "-", "\u2013": "-", "\u2014"
 
 # ── Skip list for non-geocodable locations ────────────────────────────────
 # Locations that shouldn't be geocoded (based on empirical analysis of calendar)
-SKIP_LOCATIONS: set[str] = {
-    "stakeout location",
-    "the sticks - the white house",
-}
+SKIP_LOCATIONS: frozenset[str] = frozenset(
+    {
+        "stakeout location",
+        "the sticks - the white house",
+    }
+)
+
+# Calendar stub summary for days without a public schedule (pre‑cleaned).
+_NO_PUBLIC_EVENTS = "no public events scheduled"
 
 # ── State tracking for Discord events ─────────────────────────────────────
 # Track previous states to emit events only on changes
 _prev_flight_status: str | None = None  # "airborne" | "grounded" | None
 _prev_location_reason: str | None = None  # reason field from last coords
 _is_initializing: bool = True  # Suppress events during startup
+_last_emit_key: tuple | None = None  # (lat, lon, reason, flight status) last emitted
 
 
 def _emit_state_change_events(
     coords: dict,
     plane_state: dict | None,
+    initializing: bool | None = None,
 ) -> None:
     """
     Emit Discord events for state changes.
@@ -114,13 +135,17 @@ def _emit_state_change_events(
     - landing_detected: when aircraft transitions to grounded
     - location_changed: when winning location source changes
 
-    During initialization (_is_initializing=True), updates state tracking
-    variables but skips event emission to avoid startup noise.
+    During initialization (_is_initializing=True, or *initializing* as
+    captured by the caller), updates state tracking variables but skips
+    event emission to avoid startup noise.
     """
-    global _prev_flight_status, _prev_location_reason, _is_initializing
+    global _prev_flight_status, _prev_location_reason
+
+    if initializing is None:
+        initializing = _is_initializing
 
     # During initialization, just update state without emitting events
-    if _is_initializing:
+    if initializing:
         if plane_state:
             _prev_flight_status = plane_state.get("status")
         _prev_location_reason = coords.get("reason")
@@ -164,15 +189,55 @@ def _emit_state_change_events(
         _prev_location_reason = curr_reason
 
     # ── Low confidence warning ──
-    confidence = coords.get("confidence", 0)
+    _emit_low_confidence(coords)
+
+
+def _emit_low_confidence(coords: dict) -> None:
+    """Warn when *coords* is below the confidence threshold (rate-limited)."""
     emit_low_confidence(
-        confidence=confidence,
+        confidence=coords.get("confidence", 0),
         location_name=coords.get("name", "Unknown"),
-        reason=curr_reason or "unknown",
+        reason=coords.get("reason") or "unknown",
         source=coords.get("source_display"),
     )
 
 
+def _schedule_state_change_events(coords: dict, plane_state: dict | None) -> None:
+    """
+    Run :func:`_emit_state_change_events` on the next loop iteration.
+
+    Keeps event bookkeeping off the return path of ``current_coords``. The
+    initialization flag is captured now so a deferred call made during
+    startup stays silent even if initialization completes first.
+
+    Transition checks are skipped when nothing changed since the last
+    resolve (same lat/lon, reason and flight status) – the steady polling
+    case. The low-confidence warning is not part of that key: confidence
+    can drop while the location stays put, and the warning repeats on its
+    own hourly cooldown.
+    """
+    global _last_emit_key
+
+    key = (
+        coords.get("lat"),
+        coords.get("lon"),
+        coords.get("reason"),
+        plane_state.get("status") if plane_state else None,
+    )
+    if key == _last_emit_key:
+        if (
+            not _is_initializing
+            and coords.get("confidence", 0) < LOW_CONFIDENCE_THRESHOLD
+        ):
+            asyncio.get_running_loop().call_soon(_emit_low_confidence, coords)
+        return
+    _last_emit_key = key
+
+    asyncio.get_running_loop().call_soon(
+        _emit_state_change_events, coords, plane_state, _is_initializing
+    )
+
+
 LOG = logging.getLogger("location_service")
 
 
@@ -207,10 +272,21 @@ def select_highest_confidence(candidates: list[dict]) -> dict | None:
     return max(candidates, key=lambda c: c.get("confidence", 0))
 
 
+@functools.lru_cache(maxsize=1024)
 def _clean(text: str) -> str:
-    """Normalise Unicode, squash NBSP & fancy dashes, strip + lower‑case."""
+    """Normalise Unicode, squash NBSP & fancy dashes, strip + lower‑case.
+
+    Pure, so memoised: the same calendar strings recur on every poll.
+    ASCII input is already NFKC and holds none of the TRANSLATE characters,
+    so it skips straight to strip + lower‑case.  Other input is only
+    re‑composed when the NFKC quick check says it isn't normalised yet.
+    """
 
-    return unicodedata.normalize("NFKC", text).translate(TRANSLATE).strip().lower()
+    if text.isascii():
+        return text.strip().lower()
+    if not unicodedata.is_normalized("NFKC", text):
+        text = unicodedata.normalize("NFKC", text)
+    return text.translate(TRANSLATE).strip().lower()
 
 def parse_tfr_coordinates(description: str) -> dict[str, float] | None:
     """
@@ -227,37 +303,27 @@ def parse_tfr_coordinates(description: str) -> dict[str, float] | None:
         - Longitude must be between -180 and 180
         - Coordinates must match format: N40.7, W74.0 (or S/E)
     """
-    import logging
-    
     # Match coordinates like "N40.7128, W74.0060"
     m = COORD_RE.search(description)
     if not m:
         return None
     
     try:
-        # Parse latitude (group 1: like "N40.7128")
-        lat_str = m.group(1)
-        lat_value = float(lat_str[1:])  # Remove direction letter
-        
+        lat_dir, lat_num, lon_dir, lon_num = m.groups()
+
         # Apply sign based on direction (N=positive, S=negative)
-        if lat_str[0] == "S":
+        lat_value = float(lat_num)
+        if lat_dir == "S":
             lat_value = -lat_value
-        elif lat_str[0] != "N":
-            return None  # Invalid direction
-        
-        # Parse longitude (group 2: like "W74.0060" or "E151.2093")
-        lon_str = m.group(2)
-        # Handle both "W74" and "-74" formats
-        if lon_str[0] in ("W", "E"):
-            lon_value = float(lon_str[1:])
-            if lon_str[0] == "W":
-                lon_value = -lon_value
-        else:
-            lon_value = float(lon_str)  # Already has sign
+
+        # Longitude: "W74.0" and "-74.0" are west; "E151.2" / bare digits east
+        lon_value = float(lon_num)
+        if lon_dir in ("W", "-"):
+            lon_value = -lon_value
         
         # Validate bounds
         if not (-90 <= lat_value <= 90):
-            logging.getLogger("location_service").warning(
+            LOG.warning(
                 "Invalid latitude in TFR description: %s (lat=%.2f)",
                 description,
                 lat_value,
@@ -265,7 +331,7 @@ def parse_tfr_coordinates(description: str) -> dict[str, float] | None:
             return None
         
         if not (-180 <= lon_value <= 180):
-            logging.getLogger("location_service").warning(
+            LOG.warning(
                 "Invalid longitude in TFR description: %s (lon=%.2f)",
                 description,
                 lon_value,
@@ -275,7 +341,7 @@ def parse_tfr_coordinates(description: str) -> dict[str, float] | None:
         return {"lat": lat_value, "lon": lon_value}
     
     except (ValueError, IndexError) as e:
-        logging.getLogger("location_service").warning(
+        LOG.warning(
             "Failed to parse TFR coordinates from '%s': %s",
             description,
             e,
@@ -285,10 +351,12 @@ def parse_tfr_coordinates(description: str) -> dict[str, float] | None:
 
 
 
-def _age_h(ts_utc: dt.datetime) -> float:
-    """Return age in hours for a UTC timestamp."""
+def _age_h(ts_utc: dt.datetime, now: dt.datetime | None = None) -> float:
+    """Return age in hours for a UTC timestamp (relative to *now* if given)."""
 
-    return (dt.datetime.now(UTC) - ts_utc).total_seconds() / 3600.0
+    if now is None:
+        now = dt.datetime.now(UTC)
+    return (now - ts_utc).total_seconds() / 3600.0
 
 
 def _age_human(age_h: float) -> str:
@@ -301,6 +369,14 @@ def _age_human(age_h: float) -> str:
     return f"{int(round(age_h / 24))} d ago"
 
 
+def _mk_coords(base: dict, **extra: Any) -> dict:
+    """Return a copy of *base* with *extra* keys merged in (one dict, one update)."""
+
+    coords = dict(base)
+    coords.update(extra)
+    return coords
+
+
 def _stamp(
     coords: dict,
     *,
@@ -321,11 +397,56 @@ def _stamp(
 def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """Great‑circle distance (km) between *lat1/lon1* and *lat2/lon2*."""
 
-    φ1, φ2 = map(math.radians, (lat1, lat2))
-    dφ = math.radians(lat2 - lat1)
-    dλ = math.radians(lon2 - lon1)
-    a = math.sin(dφ / 2) ** 2 + math.cos(φ1) * math.cos(φ2) * math.sin(dλ / 2) ** 2
-    return 2 * R_EARTH_KM * math.asin(math.sqrt(a))
+    φ1 = lat1 * _DEG
+    φ2 = lat2 * _DEG
+    sin_dφ = math.sin((φ2 - φ1) * 0.5)
+    sin_dλ = math.sin((lon2 - lon1) * _HALF_DEG)
+    a = sin_dφ * sin_dφ + math.cos(φ1) * math.cos(φ2) * sin_dλ * sin_dλ
+    return _EARTH_DIAMETER_KM * math.asin(math.sqrt(a))
+
+
+def _unit_vector(lat: float, lon: float) -> tuple[float, float, float]:
+    """Return the 3‑D unit‑sphere vector for *lat/lon* (decimal degrees)."""
+
+    φ, λ = math.radians(lat), math.radians(lon)
+    cos_φ = math.cos(φ)
+    return (cos_φ * math.cos(λ), cos_φ * math.sin(λ), math.sin(φ))
+
+
+# ── TFR centre index ─────────────────────────────────────────────────────
+# Unit vectors for the *current* memoised `_vip_json` list (whose records
+# already carry parsed ``_latlon`` centres). Rebuilt only when `_vip_json`
+# hands back a different list object.
+_tfr_index: tuple[list[dict], list[tuple[float, float, float]]] | None = None
+
+
+def _tfr_vectors(recs: list[dict]) -> list[tuple[float, float, float]]:
+    """Return one unit vector per record in *recs*, cached per record list."""
+    global _tfr_index
+
+    if _tfr_index is not None and _tfr_index[0] is recs:
+        return _tfr_index[1]
+
+    vectors = [_unit_vector(r["_latlon"]["lat"], r["_latlon"]["lon"]) for r in recs]
+    _tfr_index = (recs, vectors)
+    return vectors
+
+
+def _near_tfr(
+    lat: float, lon: float, recs: list[dict], radius_km: float = TFR_RADIUS_KM
+) -> bool:
+    """
+    True if *lat/lon* lies within *radius_km* of any TFR centre in *recs*.
+
+    Compares dot products of unit vectors against ``cos(radius / R)``, which
+    is the exact great‑circle test without per‑record trigonometry.
+    """
+    vectors = _tfr_vectors(recs)
+    if not vectors:
+        return False
+    px, py, pz = _unit_vector(lat, lon)
+    min_dot = math.cos(radius_km / R_EARTH_KM)
+    return any(px * x + py * y + pz * z > min_dot for x, y, z in vectors)
 
 
 def _is_physically_feasible(
@@ -454,15 +575,16 @@ def _disambiguate_results(
     # === LAYER 2: Context Proximity Ranking ===
     context_coords = [(ev["lat"], ev["lon"]) for ev in context_events]
     centroid = _compute_centroid(context_coords)
-    best = min(
-        feasible_results,
-        key=lambda r: _haversine_km(centroid[0], centroid[1], r.latitude, r.longitude),
+    # One distance per candidate; the winner's distance is reused by Layer 3.
+    distance_km, best = min(
+        (
+            (_haversine_km(centroid[0], centroid[1], r.latitude, r.longitude), r)
+            for r in feasible_results
+        ),
+        key=lambda pair: pair[0],
     )
 
     # === LAYER 3: Suspicious Distance Alert ===
-    distance_km = _haversine_km(
-        centroid[0], centroid[1], best.latitude, best.longitude
-    )
     if distance_km > SUSPICIOUS_DISTANCE_KM:
         return best, {
             "type": "suspicious_distance",
@@ -487,7 +609,9 @@ def _likely_trump_tfr(rec: dict) -> bool:
 
 
 # ── Geocoder (polite rate‑limited) ───────────────────────────────────────
-_nominatim = Nominatim(user_agent="rain-on-trump")
+# Pin the requests-based adapter: it keeps one pooled Session per geocoder,
+# so cache misses reuse the TLS connection instead of reconnecting each time.
+_nominatim = Nominatim(user_agent="rain-on-trump", adapter_factory=RequestsAdapter)
 _geocode_raw = RateLimiter(_nominatim.geocode, min_delay_seconds=1)
 
 _geocode_log = logging.getLogger("location_service.geocode")
@@ -500,30 +624,107 @@ def _should_skip_geocode(location: str) -> bool:
 
 
 # ── Geocode result cache ─────────────────────────────────────────────────
-# Prevents redundant Nominatim calls for the same query within TTL period.
-# Keyed by cleaned query string; stores (timestamp, result) tuples.
-_geocode_cache: dict[str, tuple[dt.datetime, object]] = {}
-GEOCODE_CACHE_TTL_S: Final = 900  # 15 minutes (matches calendar cache)
+# Place names don't move, so successful lookups are kept indefinitely (up to
+# GEOCODE_CACHE_MAX entries) and written through to disk next to the geocode
+# log.  Only context-free lookups are cached: a pick made by disambiguating
+# against nearby events is specific to that context.  Misses are remembered
+# for a day so an unresolvable calendar location doesn't cost a Nominatim
+# round trip on every refresh.  Errors are never cached.
+class _CachedPlace(NamedTuple):
+    """Minimal stand-in for ``geopy.Location`` served from the cache."""
+
+    latitude: float
+    longitude: float
+    address: str
+    raw: dict
+
+
+GEOCODE_CACHE_FILE = GEOCODE_DIR / "geocode_cache.json"
+GEOCODE_MISS_TTL_S: Final = 86400  # 24 hours
+GEOCODE_CACHE_MAX: Final = 2000  # oldest entries are dropped beyond this
+
+
+def _load_geocode_cache() -> dict[str, _CachedPlace]:
+    """Load persisted geocode results (empty dict if missing or corrupt)."""
+    if not GEOCODE_CACHE_FILE.exists():
+        return {}
+    try:
+        data = orjson.loads(GEOCODE_CACHE_FILE.read_bytes())
+        return {key: _CachedPlace(*row) for key, row in data.items()}
+    except Exception as exc:  # noqa: BLE001 – corrupted file?
+        _geocode_log.warning("Failed to load geocode cache: %s", exc)
+        return {}
 
 
-def _get_cached_geocode(query: str) -> object | None:
-    """Return cached geocode result if still valid, else None."""
-    key = _clean(query)
-    if key not in _geocode_cache:
-        return None
-    ts, result = _geocode_cache[key]
-    if (dt.datetime.now(UTC) - ts).total_seconds() < GEOCODE_CACHE_TTL_S:
+def _save_geocode_cache() -> None:
+    """Persist positive geocode results to disk (temp file + rename)."""
+    try:
+        tmp = GEOCODE_CACHE_FILE.with_name(GEOCODE_CACHE_FILE.name + ".tmp")
+        tmp.write_bytes(
+            orjson.dumps({key: list(place) for key, place in _geocode_cache.items()})
+        )
+        os.replace(tmp, GEOCODE_CACHE_FILE)
+    except Exception as exc:  # noqa: BLE001
+        _geocode_log.warning("Failed to save geocode cache: %s", exc)
+
+
+_geocode_cache: dict[str, _CachedPlace] = _load_geocode_cache()
+_geocode_misses: dict[str, float] = {}  # key → monotonic ts of the miss
+
+
+def _get_cached_geocode(query: str) -> _CachedPlace | None:
+    """Return the cached geocode result for *query*, if any."""
+    result = _geocode_cache.get(_clean(query))
+    if result is not None:
         _geocode_log.debug("Cache hit for: %r", query)
-        return result
-    # Expired
-    del _geocode_cache[key]
-    return None
+    return result
+
+
+def _is_cached_miss(query: str) -> bool:
+    """Return True if *query* recently returned no Nominatim results."""
+    key = _clean(query)
+    ts = _geocode_misses.get(key)
+    if ts is None:
+        return False
+    if time.monotonic() - ts < GEOCODE_MISS_TTL_S:
+        return True
+    del _geocode_misses[key]
+    return False
 
 
-def _set_cached_geocode(query: str, result: object) -> None:
-    """Store geocode result in cache."""
+def _set_cached_geocode(query: str, result: Any) -> None:
+    """Store a successful geocode result in the cache and on disk."""
+    raw = result.raw or {}
     key = _clean(query)
-    _geocode_cache[key] = (dt.datetime.now(UTC), result)
+    _geocode_cache.pop(key, None)
+    while len(_geocode_cache) >= GEOCODE_CACHE_MAX:
+        del _geocode_cache[next(iter(_geocode_cache))]
+    _geocode_cache[key] = _CachedPlace(
+        float(result.latitude),
+        float(result.longitude),
+        str(result.address),
+        {"address": raw.get("address", {}), "importance": raw.get("importance")},
+    )
+    _save_geocode_cache()
+
+
+def _set_cached_miss(query: str) -> None:
+    """Remember that *query* returned no results."""
+    _geocode_misses[_clean(query)] = time.monotonic()
+
+
+# Log/alert calls made by _smart_geocode inside _smart_geocode_async's worker
+# thread are queued here and replayed on the event loop afterwards.
+_deferred = threading.local()
+
+
+def _after_geocode(fn: Any, /, **kwargs: Any) -> None:
+    """Call a geocode log/alert hook now, or defer it when in a worker."""
+    calls = getattr(_deferred, "calls", None)
+    if calls is None:
+        fn(**kwargs)
+    else:
+        calls.append((fn, kwargs))
 
 
 def _smart_geocode(
@@ -555,17 +756,22 @@ def _smart_geocode(
     # Check skip list
     if _should_skip_geocode(query):
         _geocode_log.debug("Skipped (in skip list): %r", query)
-        add_geocode_entry(query=query, result_type="skipped")
+        _after_geocode(add_geocode_entry, query=query, result_type="skipped")
         return None
 
-    # Check cache first (avoids redundant Nominatim calls)
-    cached = _get_cached_geocode(query)
-    if cached is not None:
-        return cached
-
     # Determine if we should use multi-result mode
     use_disambiguation = bool(context_events and target_dt)
 
+    # Check cache first (avoids redundant Nominatim calls); disambiguated
+    # lookups depend on their context, so they bypass the positive cache
+    cached = None if use_disambiguation else _get_cached_geocode(query)
+    if cached is not None:
+        return cached
+    if _is_cached_miss(query):
+        _geocode_log.debug("Cached miss for: %r", query)
+        return None
+    us_failed = False
+
     # Try US-first
     try:
         if use_disambiguation:
@@ -601,7 +807,8 @@ def _smart_geocode(
                 # Emit alerts
                 if alert:
                     if alert["type"] == "suspicious_distance":
-                        emit_suspicious_geocode(
+                        _after_geocode(
+                            emit_suspicious_geocode,
                             query=query,
                             best_lat=result.latitude,
                             best_lon=result.longitude,
@@ -609,7 +816,8 @@ def _smart_geocode(
                             distance_km=alert["distance_km"],
                         )
                     elif alert["type"] == "all_infeasible":
-                        emit_all_results_infeasible(
+                        _after_geocode(
+                            emit_all_results_infeasible,
                             query=query,
                             results_count=alert["results_count"],
                             context_events=context_events,
@@ -632,7 +840,8 @@ def _smart_geocode(
                         target_dt=target_dt,
                     )
                     if alert and alert["type"] == "suspicious_distance":
-                        emit_suspicious_geocode(
+                        _after_geocode(
+                            emit_suspicious_geocode,
                             query=query,
                             best_lat=result.latitude,
                             best_lon=result.longitude,
@@ -653,7 +862,8 @@ def _smart_geocode(
                 state,
                 importance or 0,
             )
-            add_geocode_entry(
+            _after_geocode(
+                add_geocode_entry,
                 query=query,
                 result_type="us",
                 lat=result.latitude,
@@ -665,18 +875,23 @@ def _smart_geocode(
             )
             # Alert on low importance scores
             if importance is not None and importance < LOW_IMPORTANCE_THRESHOLD:
-                emit_low_importance_geocode(
+                _after_geocode(
+                    emit_low_importance_geocode,
                     query=query,
                     importance=importance,
                     lat=result.latitude,
                     lon=result.longitude,
                     display_name=result.address,
                 )
-            _set_cached_geocode(query, result)
+            if not use_disambiguation:
+                _set_cached_geocode(query, result)
             return result
     except Exception as e:  # noqa: BLE001
         _geocode_log.warning("US geocode failed for %r: %s", query, e)
-        add_geocode_entry(query=query, result_type="error", error=str(e))
+        _after_geocode(
+            add_geocode_entry, query=query, result_type="error", error=str(e)
+        )
+        us_failed = True
         # Don't emit Discord yet - try international fallback first
 
     # Fallback to international
@@ -699,7 +914,8 @@ def _smart_geocode(
                 country,
                 importance or 0,
             )
-            add_geocode_entry(
+            _after_geocode(
+                add_geocode_entry,
                 query=query,
                 result_type="international",
                 lat=result.latitude,
@@ -711,43 +927,92 @@ def _smart_geocode(
             )
             # Alert on low importance scores
             if importance is not None and importance < LOW_IMPORTANCE_THRESHOLD:
-                emit_low_importance_geocode(
+                _after_geocode(
+                    emit_low_importance_geocode,
                     query=query,
                     importance=importance,
                     lat=result.latitude,
                     lon=result.longitude,
                     display_name=result.address,
                 )
-            _set_cached_geocode(query, result)
+            if not use_disambiguation:
+                _set_cached_geocode(query, result)
             return result
     except Exception as e:  # noqa: BLE001
         _geocode_log.warning("International geocode failed for %r: %s", query, e)
-        add_geocode_entry(query=query, result_type="error", error=str(e))
-        emit_geocode_failure(query=query, result_type="error", error=str(e))
+        _after_geocode(
+            add_geocode_entry, query=query, result_type="error", error=str(e)
+        )
+        _after_geocode(
+            emit_geocode_failure, query=query, result_type="error", error=str(e)
+        )
         return None
 
     _geocode_log.warning("Geocode returned no results for: %r", query)
-    add_geocode_entry(query=query, result_type="no_result")
-    emit_geocode_failure(query=query, result_type="no_result")
+    if not us_failed:
+        _set_cached_miss(query)
+    _after_geocode(add_geocode_entry, query=query, result_type="no_result")
+    _after_geocode(emit_geocode_failure, query=query, result_type="no_result")
     return None
 
+
+# Nominatim allows one request per second; the RateLimiter sleeps in the
+# calling thread, so run geocodes in a worker thread and queue them here
+# instead of stacking up blocked threads (or blocking the event loop).
+_GEOCODE_SEM = asyncio.Semaphore(1)
+
+
+def _smart_geocode_deferring(query: str, timeout: int, **kwargs: Any):
+    """Worker-thread body: geocode, collecting log/alert calls for the loop."""
+    _deferred.calls = calls = []
+    try:
+        return _smart_geocode(query, timeout, **kwargs), calls
+    finally:
+        _deferred.calls = None
+
+
+async def _smart_geocode_async(query: str, timeout: int = 10, **kwargs: Any):
+    """Run :func:`_smart_geocode` off the event loop, one call at a time.
+
+    The geocode log writes and Discord alerts it triggers run back on the
+    event loop once the slot is released, so webhooks are scheduled as
+    tasks instead of blocking the worker (and the queue behind it).
+    """
+    async with _GEOCODE_SEM:
+        result, calls = await asyncio.to_thread(
+            _smart_geocode_deferring, query, timeout, **kwargs
+        )
+    for fn, fn_kwargs in calls:
+        fn(**fn_kwargs)
+    return result
+
+
 # ── Async TTL cache decorator ────────────────────────────────────────────
-_cached: Dict[str, Tuple[dt.datetime, Any]] = {}
+_cached: Dict[tuple, Tuple[float, Any]] = {}  # key → (monotonic ts, value)
+_inflight: Dict[tuple, asyncio.Future] = {}
 
 
 def memo(seconds: int = 600):
-    """Decorate a coroutine with a simple per‑process TTL cache."""
+    """Decorate a coroutine with a per‑process TTL cache keyed by arguments.
+
+    Concurrent misses for the same key share one in‑flight call, so a burst
+    of callers triggers a single upstream request.
+    """
 
     def decorator(fn):
         async def wrapper(*args, **kwargs):  # type: ignore[override]
-            now = dt.datetime.now(UTC)
-            ts, val = _cached.get(
-                fn.__name__, (dt.datetime.min.replace(tzinfo=UTC), None)
-            )
-            if (now - ts).total_seconds() < seconds:
-                return val
-            val = await fn(*args, **kwargs)
-            _cached[fn.__name__] = (now, val)
+            key = (fn.__name__, args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            hit = _cached.get(key)
+            if hit is not None and now - hit[0] < seconds:
+                return hit[1]
+            task = _inflight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(fn(*args, **kwargs))
+                _inflight[key] = task
+                task.add_done_callback(lambda _t: _inflight.pop(key, None))
+            val = await asyncio.shield(task)
+            _cached[key] = (now, val)
             return val
 
         wrapper.__wrapped__ = fn  # type: ignore[attr-defined]
@@ -756,6 +1021,32 @@ def memo(seconds: int = 600):
     return decorator
 
 
+# ── Shared HTTP client ───────────────────────────────────────────────────
+# One pooled client for the module so TCP/TLS connections are reused across
+# refreshes.  Created lazily; closed from the app's lifespan shutdown.
+_HTTP_CLIENT: httpx.AsyncClient | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared ``httpx.AsyncClient``, creating it on first use."""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None or _HTTP_CLIENT.is_closed:
+        _HTTP_CLIENT = httpx.AsyncClient(
+            timeout=10,
+            headers={"User-Agent": USER_AGENT},
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        )
+    return _HTTP_CLIENT
+
+
+async def aclose_http_client() -> None:
+    """Close the shared HTTP client (call on application shutdown)."""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is not None:
+        await _HTTP_CLIENT.aclose()
+        _HTTP_CLIENT = None
+
+
 # ── FAA VIP‑TFR JSON helper ─────────────────────────────────────────────
 @memo(300)
 async def _vip_json(include_security: bool = False) -> List[Dict[str, Any]]:
@@ -768,11 +1059,9 @@ async def _vip_json(include_security: bool = False) -> List[Dict[str, Any]]:
         return []
 
     now = dt.datetime.now(UTC)
-    headers = {"User-Agent": USER_AGENT}
     try:
-        async with httpx.AsyncClient(timeout=10, headers=headers) as cli:
-            resp = await logged_request_async(cli, "get", TFR_JSON_URL)
-            data = resp.json()
+        resp = await logged_request_async(_get_client(), "get", TFR_JSON_URL)
+        data = orjson.loads(resp.content)
     except Exception:  # noqa: BLE001 – network/JSON errors → empty list
         return []
 
@@ -792,23 +1081,55 @@ async def _vip_json(include_security: bool = False) -> List[Dict[str, Any]]:
             continue
         if not (begin <= now <= end):
             continue
-        if _wanted(rec):
-            records.append(rec)
+        if not _wanted(rec):
+            continue
+        # Parse the centre once here; records without one are useless
+        # downstream (proximity check and step 3 both need coordinates).
+        latlon = parse_tfr_coordinates(rec.get("description", ""))
+        if latlon is None:
+            continue
+        rec["_latlon"] = latlon
+        records.append(rec)
     return records
 
 
 # ── Main public helper ───────────────────────────────────────────────────
+class _NullLog:
+    """Write‑only trace sink used when the caller did not ask for a trace."""
+
+    __slots__ = ()
+
+    def append(self, _entry: Any) -> None:
+        pass
+
+
+_NULL_LOG = _NullLog()
+
+
 async def current_coords(
-    *, trace: Optional[List[Dict[str, Any]]] = None
+    *, trace: Optional[List[Dict[str, Any]]] = None, bypass_cache: bool = False
 ) -> Union[Dict[str, Any], Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
-    """Return best‑guess coordinates for Donald Trump **right now**."""
+    """Return best‑guess coordinates for Donald Trump **right now**.
 
-    ts_now = dt.datetime.now(UTC).isoformat()
-    trace_log = trace if trace is not None else []
+    Trace‑less calls share one result for ``COORDS_CACHE_S`` seconds; pass
+    a *trace* list or ``bypass_cache=True`` to force a fresh resolve.
+    """
+
+    if trace is None and not bypass_cache:
+        return await _current_coords_cached()
+
+    now = dt.datetime.now(UTC)
+    ts_now = now.isoformat()
+    trace_log = trace if trace is not None else _NULL_LOG
     trace_log.append({"ts": ts_now, "phase": "loc", "step": "start"})
 
     # ── 1️⃣  ADS‑B feeds --------------------------------------------------
-    plane_raw = await asyncio.to_thread(get_plane_state)
+    # The plane lookup (sync, so off the loop) and the TFR feed are
+    # independent I/O — overlap them instead of paying for both in series.
+    plane_raw, vip_recs = await asyncio.gather(
+        asyncio.to_thread(get_plane_state),
+        _vip_json(include_security=True),
+    )
     if isinstance(plane_raw, dict) and "state" in plane_raw:
         plane_state = plane_raw["state"]
         plane_errors = plane_raw.get("errors")
@@ -849,7 +1170,7 @@ async def current_coords(
             source="ADS‑B (airborne)",
             url=plane_state.get("tracker_url"),
         )
-        _emit_state_change_events(coords_air, plane_state)
+        _schedule_state_change_events(coords_air, plane_state)
         return (coords_air, trace_log) if trace else coords_air
 
     if (
@@ -859,14 +1180,7 @@ async def current_coords(
     ):
         # Grounded but *newer* than any calendar entry → keep
         # NOTE: TFR check below is no-op when TFR_ENABLED=False (always near_tfr=False)
-        near_tfr = False
-        for rec in await _vip_json(include_security=True):
-            coords = parse_tfr_coordinates(rec.get("description", ""))
-            if not coords:
-                continue
-            if _haversine_km(plane_state["lat"], plane_state["lon"], coords["lat"], coords["lon"]) < 55:
-                near_tfr = True
-                break
+        near_tfr = _near_tfr(plane_state["lat"], plane_state["lon"], vip_recs)
 
         # Use confidence from flight_service (with age decay) + TFR bonus
         base_confidence = plane_state.get("confidence", 90)
@@ -881,7 +1195,7 @@ async def current_coords(
                 "confidence": confidence,
                 "reason": "plane_tfr" if near_tfr else "plane_ground",
             },
-            age_h=_age_h(plane_state["ts"]),
+            age_h=_age_h(plane_state["ts"], now),
             source="ADS‑B (grounded)",
             url=plane_state.get("tracker_url"),
         )
@@ -894,13 +1208,13 @@ async def current_coords(
                 "coords": coords_ground,
             }
         )
-        _emit_state_change_events(coords_ground, plane_state)
+        _schedule_state_change_events(coords_ground, plane_state)
         return (coords_ground, trace_log) if trace else coords_ground
 
     # ── 1.5️⃣ Overnight base inference ------------------------------------
     # During overnight hours (9PM-8AM ET), if evening and morning events
     # are in the same region (DC, FL, or NJ), infer the overnight base.
-    overnight_base = cal.get_overnight_base()
+    overnight_base = cal.get_overnight_base(now=now)
     if overnight_base:
         # Determine reason based on base name
         name = overnight_base["name"]
@@ -912,11 +1226,7 @@ async def current_coords(
             reason = "overnight_nj"  # Bedminster
 
         coords_overnight = _stamp(
-            {
-                **overnight_base,
-                "confidence": 58,
-                "reason": reason,
-            },
+            _mk_coords(overnight_base, confidence=58, reason=reason),
             source="Overnight inference (evening→morning pattern)",
             url=FACTBASE_URL,
         )
@@ -928,7 +1238,7 @@ async def current_coords(
                 "coords": coords_overnight,
             }
         )
-        _emit_state_change_events(coords_overnight, plane_state)
+        _schedule_state_change_events(coords_overnight, plane_state)
         return (coords_overnight, trace_log) if trace else coords_overnight
 
     # ── 2️⃣  Calendar event ----------------------------------------------
@@ -945,69 +1255,59 @@ async def current_coords(
         raw_summary = event.get("summary", "")
         desc = _clean(raw_location)
         summ = _clean(raw_summary)
-        age_cal = _age_h(event["dtstart_utc"])
-        if "no public events scheduled" not in summ:
+        age_cal = _age_h(event["dtstart_utc"], now)
+        if _NO_PUBLIC_EVENTS not in summ:
             cal_conf = CAL_BASE_CONF - (
                 (CAL_BASE_CONF - CAL_MIN_CONF)
                 * min(age_cal, CAL_WINDOW_H)
                 / CAL_WINDOW_H
             )
 
-            # 2a. Alias on location
-            for key, alias in PLACE_ALIASES.items():
-                if key in desc:
-                    coords_cal = _stamp(
-                        {
-                            **alias,
-                            "confidence": cal_conf,
-                            "reason": "calendar_alias",
-                            "event_summary": raw_summary,
-                        },
-                        age_h=age_cal,
-                        source="Factba.se schedule",
-                        url=FACTBASE_URL,
-                    )
-                    if cal_conf < CAL_MIN_CONF:
-                        last_known_calendar = coords_cal
-                    break
-            # 2b. Alias on summary
-            if not coords_cal:
-                for key, alias in PLACE_ALIASES.items():
-                    if key in summ:
-                        coords_cal = _stamp(
-                            {
-                                **alias,
-                                "confidence": cal_conf,
-                                "reason": "calendar_summary",
-                                "event_summary": raw_summary,
-                            },
-                            age_h=age_cal,
-                            source="Factba.se schedule",
-                            url=FACTBASE_URL,
-                        )
-                        if cal_conf < CAL_MIN_CONF:
-                            last_known_calendar = coords_cal
-                        break
+            # 2a. Alias on location, 2b. alias on summary
+            alias = find_alias(desc)
+            alias_reason = "calendar_alias"
+            if alias is None:
+                alias = find_alias(summ)
+                alias_reason = "calendar_summary"
+            if alias is not None:
+                coords_cal = _stamp(
+                    _mk_coords(
+                        alias,
+                        confidence=cal_conf,
+                        reason=alias_reason,
+                        event_summary=raw_summary,
+                    ),
+                    age_h=age_cal,
+                    source="Factba.se schedule",
+                    url=FACTBASE_URL,
+                )
+                if cal_conf < CAL_MIN_CONF:
+                    last_known_calendar = coords_cal
             # 2c. Geocode fallback (US-first with hybrid disambiguation)
             if desc and not coords_cal:
-                # Get context events for disambiguation (coords + timestamps)
-                context_events = cal.get_context_events(event)
-
-                # Log context retrieval for debug endpoint
-                trace_log.append({
-                    "ts": ts_now,
-                    "phase": "loc",
-                    "step": "geocode_context",
-                    "query": raw_location,
-                    "context_count": len(context_events),
-                })
-
-                geocoded = _smart_geocode(
-                    desc,
-                    timeout=10,
-                    context_events=context_events,
-                    target_dt=event["dtstart_utc"],
-                )
+                if cal_conf < CAL_MIN_CONF:
+                    # Aged out: the result can only become `last_known`, so
+                    # reuse a cached geocode rather than calling Nominatim.
+                    geocoded = _get_cached_geocode(desc)
+                else:
+                    # Get context events for disambiguation (coords + timestamps)
+                    context_events = cal.get_context_events(event)
+
+                    # Log context retrieval for debug endpoint
+                    trace_log.append({
+                        "ts": ts_now,
+                        "phase": "loc",
+                        "step": "geocode_context",
+                        "query": raw_location,
+                        "context_count": len(context_events),
+                    })
+
+                    geocoded = await _smart_geocode_async(
+                        desc,
+                        timeout=10,
+                        context_events=context_events,
+                        target_dt=event["dtstart_utc"],
+                    )
                 if geocoded:
                     # Log geocode result for debug endpoint
                     trace_log.append({
@@ -1038,31 +1338,33 @@ async def current_coords(
     # Collect TFR candidate (don't return early - compare with calendar)
     # NOTE: This step is no-op when TFR_ENABLED=False (vip_recs always empty)
     coords_tfr: Optional[dict] = None
-    vip_recs = await _vip_json(include_security=True)
     if vip_recs:
         best = vip_recs[0]  # newest because _vip_json keeps current only
-        tfr_coords = parse_tfr_coordinates(best.get("description", ""))
-        if tfr_coords:
-            coords_tfr = _stamp(
-                {
-                    "lat": tfr_coords["lat"],
-                    "lon": tfr_coords["lon"],
-                    "name": best.get("shortDesc", "VIP‑TFR"),
-                    "confidence": 40,
-                    "reason": "tfr_json",
-                },
-                source="FAA VIP‑TFR JSON",
-                url=TFR_JSON_URL,
-            )
-            trace_log.append(
-                {"ts": ts_now, "phase": "loc", "step": "vip_json", "coords": coords_tfr}
-            )
+        coords_tfr = _stamp(
+            {
+                "lat": best["_latlon"]["lat"],
+                "lon": best["_latlon"]["lon"],
+                "name": best.get("shortDesc", "VIP‑TFR"),
+                "confidence": 40,
+                "reason": "tfr_json",
+            },
+            source="FAA VIP‑TFR JSON",
+            url=TFR_JSON_URL,
+        )
+        trace_log.append(
+            {"ts": ts_now, "phase": "loc", "step": "vip_json", "coords": coords_tfr}
+        )
 
     # ── Compare calendar vs TFR by confidence ──
-    candidates = [c for c in [coords_cal, coords_tfr] if c is not None]
-    best_candidate = select_highest_confidence(candidates)
+    # Two candidates at most – inline max; calendar wins ties (as before).
+    if coords_cal and (
+        not coords_tfr or coords_cal["confidence"] >= coords_tfr["confidence"]
+    ):
+        best_candidate = coords_cal
+    else:
+        best_candidate = coords_tfr
     if best_candidate:
-        _emit_state_change_events(best_candidate, plane_state)
+        _schedule_state_change_events(best_candidate, plane_state)
         return (best_candidate, trace_log) if trace else best_candidate
 
     # ── 4️⃣  Newswire ------------------------------------------------------
@@ -1072,11 +1374,11 @@ async def current_coords(
     )
     if news_coord:
         coords_news = _stamp(
-            {**news_coord, "confidence": 35, "reason": "newswire"},
+            _mk_coords(news_coord, confidence=35, reason="newswire"),
             source="GDELT dateline",
             url="https://www.gdeltproject.org/",
         )
-        _emit_state_change_events(coords_news, plane_state)
+        _schedule_state_change_events(coords_news, plane_state)
         return (coords_news, trace_log) if trace else coords_news
 
     # ── 5️⃣  Last aircraft arrival cache ----------------------------------
@@ -1086,7 +1388,7 @@ async def current_coords(
         trace_log.append(
             {"ts": ts_now, "phase": "loc", "step": "last_known", "coords": coords_last}
         )
-        _emit_state_change_events(coords_last, plane_state)
+        _schedule_state_change_events(coords_last, plane_state)
         return (coords_last, trace_log) if trace else coords_last
 
     # ── 🤷  Unknown --------------------------------------------------------
@@ -1098,5 +1400,20 @@ async def current_coords(
     if last_known_calendar:
         coords_unknown["last_known"] = last_known_calendar
     trace_log.append({"ts": ts_now, "phase": "loc", "step": "unknown"})
-    _emit_state_change_events(coords_unknown, plane_state)
+    _schedule_state_change_events(coords_unknown, plane_state)
     return (coords_unknown, trace_log) if trace else coords_unknown
+
+
+async def current_coords_with_trace(
+    trace: Optional[List[Dict[str, Any]]] = None,
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Fresh ``current_coords`` resolve that always returns ``(coords, trace)``."""
+    return await current_coords(
+        trace=trace if trace is not None else [], bypass_cache=True
+    )
+
+
+@memo(COORDS_CACHE_S)
+async def _current_coords_cached() -> Dict[str, Any]:
+    """Shared short‑TTL resolve for trace‑less callers (see current_coords)."""
+    return await current_coords(bypass_cache=True)
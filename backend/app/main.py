@@ -16,16 +16,27 @@ from __future__ import annotations
 import asyncio
 import contextlib
 import datetime as dt
+import functools
 import os
 import secrets
+import time
+from collections import deque
 from contextlib import asynccontextmanager
+from html import escape
 from typing import Any
 
+import orjson
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, Query, Request
-from fastapi.encoders import jsonable_encoder
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
+from fastapi.responses import (
+    HTMLResponse,
+    JSONResponse,
+    ORJSONResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
 from slowapi import Limiter
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
@@ -34,8 +45,9 @@ from slowapi.util import get_remote_address
 from .event_service import emit_machine_started, emit_rain_state_changed
 from .flight_service import get_plane_state
 from .location_service import (
-    _cached as _loc_cache,
+    aclose_http_client,
     current_coords,
+    current_coords_with_trace,
     mark_initialization_complete,
 )
 from .push_service import (
@@ -44,12 +56,16 @@ from .push_service import (
     cleanup_old_subscriptions,
     get_preferences,
     get_subscription_stats,
+    has_subscriptions,
     remove_subscription,
     update_preferences,
 )
 from .snapshot_service import add_snapshot, get_snapshot_stats, get_snapshots
+from .snapshot_service import store_version as snapshot_store_version
 from .geocode_log_service import get_geocode_entries, get_geocode_stats
-from .weather_service import _cached as _weather_cache, get_precip
+from .geocode_log_service import store_version as geocode_store_version
+from .weather_service import aclose_http_client as aclose_weather_client
+from .weather_service import get_precip, get_precip_with_trace
 
 # ─── Logging ──────────────────────────────────────────────────────────
 import logging
@@ -71,12 +87,24 @@ LOG.setLevel(logging.INFO)
 # ---------------------------------------------------------------------
 load_dotenv()
 BROADCAST_TOKEN = os.getenv("BROADCAST_TOKEN", "")
+if not BROADCAST_TOKEN.strip():
+    LOG.warning("BROADCAST_TOKEN is not set – admin endpoints will return 503")
 
 UTC = dt.timezone.utc
 
 # Rate limiter for subscription endpoint
 limiter = Limiter(key_func=get_remote_address)
 
+# Polling cadence: 5 min normally, 10 min once location and precipitation
+# have been unchanged for STABLE_CYCLES_BEFORE_BACKOFF consecutive readings
+# and nobody is subscribed (see _poll_interval).
+POLL_INTERVAL_S = 300
+POLL_INTERVAL_MAX_S = 600
+STABLE_CYCLES_BEFORE_BACKOFF = 3
+
+# How long /is_it_raining.json may reuse the polling loop's last reading
+LATEST_READING_MAX_AGE_S = 60
+
 # Feature flag: Set to True to require 2 consecutive checks before notifying.
 # Disabled because: Production logs show no location/weather flapping, and
 # hourly weather data makes flapping unlikely. Re-enable if notification spam occurs.
@@ -85,30 +113,175 @@ DEBOUNCE_NOTIFICATIONS = False
 # Thunderstorm notification configuration
 # State transitions: (from_state, to_state) -> (cooldown_seconds, message_template)
 # States: "none", "moderate" (WMO code 95), "severe" (codes 96, 97, 99)
-THUNDERSTORM_COOLDOWNS: dict[str, tuple[int, str]] = {
-    "none->moderate": (1800, "Thunderstorm detected at {location}"),
-    "none->severe": (1800, "Severe thunderstorm with hail at {location}!"),
-    "moderate->severe": (
+THUNDERSTORM_COOLDOWNS: dict[tuple[str, str], tuple[int, str]] = {
+    ("none", "moderate"): (1800, "Thunderstorm detected at {location}"),
+    ("none", "severe"): (1800, "Severe thunderstorm with hail at {location}!"),
+    ("moderate", "severe"): (
         900,
         "Thunderstorm intensifying at {location} - hail possible!",
     ),
-    "moderate->none": (1800, "Thunderstorm has passed at {location}"),
-    "severe->none": (1800, "Thunderstorm has passed at {location}"),
+    ("moderate", "none"): (1800, "Thunderstorm has passed at {location}"),
+    ("severe", "none"): (1800, "Thunderstorm has passed at {location}"),
+}
+
+# Precipitation notifications: (prev_type, curr_type) -> (title, template).
+# Templates are formatted via ``format_map`` with ``loc`` (location name),
+# ``prev``, ``curr``, ``rain`` and ``snow``.
+PRECIP_TRANSITIONS: dict[tuple[str, str], tuple[str, str]] = {
+    ("none", "rain"): ("It's Raining!", "It just started raining at {loc}!"),
+    ("none", "snow"): ("It's Snowing!", "It just started snowing at {loc}!"),
+    ("none", "both"): (
+        "Rain & Snow!",
+        "It just started raining and snowing at {loc}!",
+    ),
+    ("rain", "none"): ("Weather Update", "It stopped raining at {loc}."),
+    ("snow", "none"): ("Weather Update", "It stopped snowing at {loc}."),
+    ("both", "none"): ("Weather Update", "Precipitation stopped at {loc}."),
+    ("rain", "snow"): ("It's Snowing!", "Rain turned to snow at {loc}!"),
+    ("snow", "rain"): ("It's Raining!", "Snow turned to rain at {loc}!"),
+    ("rain", "both"): ("Rain & Snow!", "Now it's raining AND snowing at {loc}!"),
+    ("snow", "both"): (
+        "Rain & Snow!",
+        "Rain started - now both rain and snow at {loc}!",
+    ),
+    ("both", "rain"): ("It's Raining!", "Snow stopped - just rain now at {loc}."),
+    ("both", "snow"): ("It's Snowing!", "Rain stopped - just snow now at {loc}."),
+}
+# Fallbacks for transitions missing from the table (e.g. from an unknown state)
+_PRECIP_STOPPED = ("Weather Update", "Precipitation stopped at {loc}.")
+_PRECIP_CHANGED = ("Weather Update", "Precipitation changed to {curr} at {loc}!")
+
+# Landing straight into precipitation: curr_type -> (title, template),
+# formatted like PRECIP_TRANSITIONS
+LANDING_TRANSITIONS: dict[str, tuple[str, str]] = {
+    "rain": ("Trump Landed", "Trump just landed at {loc} - it's raining there!"),
+    "snow": ("Trump Landed", "Trump just landed at {loc} - it's snowing there!"),
+    "both": ("Trump Landed", "Trump just landed at {loc} - rain and snow falling!"),
+}
+
+# /is_it_raining.json answer templates; copied per request, then completed
+# with ``coords`` and ``timestamp`` (plus ``error`` when the weather API fails).
+_UNKNOWN_PAYLOAD: dict[str, Any] = {
+    "precipitating": None,
+    "mmh": None,
+    "precipitation_type": None,
+    "snow": None,
+    "thunderstorm": None,
+    "thunderstorm_state": None,
+    "sunrise": None,
+    "sunset": None,
+}
+_INFLIGHT_PAYLOAD: dict[str, Any] = {
+    "precipitating": False,
+    "mmh": 0.0,
+    "precipitation_type": "none",
+    "snow": 0.0,
+    "thunderstorm": False,
+    "thunderstorm_state": "none",
+    "sunrise": None,
+    "sunset": None,
 }
 
 
 # ---------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------
-async def _unwrap(awaitable):
-    """Return the first element when the awaited value is ``(data, trace)``."""
-    data = await awaitable
-    return data[0] if isinstance(data, tuple) else data
+# push_service calls block on file I/O (and broadcast on HTTPS), so they run
+# in worker threads; push_service serialises its own file updates.
+_broadcast_tasks: set[asyncio.Task] = set()
+
+
+async def _broadcast_async(
+    title: str, message: str, notification_type: str | None = None
+) -> int:
+    """Run the blocking ``broadcast`` in a worker thread."""
+    return await asyncio.to_thread(
+        broadcast, title, message, notification_type=notification_type
+    )
+
+
+def _on_broadcast_done(task: asyncio.Task) -> None:
+    _broadcast_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        LOG.error("[push] broadcast failed: %s", task.exception())
+
+
+def _dispatch_broadcast(title: str, message: str) -> None:
+    """Fire-and-forget a broadcast so WebPush I/O never blocks the event loop.
+
+    Falls back to a direct call when no event loop is running.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        broadcast(title, message)
+        return
+    task = loop.create_task(_broadcast_async(title, message))
+    _broadcast_tasks.add(task)
+    task.add_done_callback(_on_broadcast_done)
+
+
+def _poll_interval(stable_cycles: int, has_subscribers: bool) -> int:
+    """Seconds to wait before the next background check.
+
+    Open-Meteo data is hourly, so polling slows to POLL_INTERVAL_MAX_S once
+    readings have been unchanged for STABLE_CYCLES_BEFORE_BACKOFF checks –
+    but only with nobody subscribed, so a rain-start push is never delayed.
+    """
+    if has_subscribers or stable_cycles < STABLE_CYCLES_BEFORE_BACKOFF:
+        return POLL_INTERVAL_S
+    return POLL_INTERVAL_MAX_S
+
+
+@functools.lru_cache(maxsize=1)
+def _token_bytes(raw: str) -> bytes:
+    """Stripped, encoded form of the configured admin token."""
+    return raw.strip().encode()
+
+
+def _check_token(token: str) -> bool:
+    """Constant-time check of *token* against BROADCAST_TOKEN.
+
+    An unset or blank BROADCAST_TOKEN rejects every request rather than
+    matching an empty token.
+    """
+    expected = _token_bytes(BROADCAST_TOKEN)
+    return bool(expected) and secrets.compare_digest(token.strip().encode(), expected)
+
+
+async def require_admin_token(token: str = Query(...)) -> None:
+    """Dependency guarding the admin endpoints.
+
+    Raises 503 when BROADCAST_TOKEN is not configured (admin disabled) and
+    403 when *token* does not match it.
+    """
+    if not _token_bytes(BROADCAST_TOKEN):
+        raise HTTPException(
+            status_code=503, detail="Admin endpoints disabled: BROADCAST_TOKEN not set"
+        )
+    if not _check_token(token):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+_now_iso_cache: tuple[int, str] = (-1, "")
+
+
+def now_iso() -> str:
+    """Current UTC time as ISO 8601, cached at one-second resolution.
+
+    Status payloads never need sub-second precision, so concurrent requests
+    within the same second share one formatted string.
+    """
+    global _now_iso_cache
+    sec = time.time_ns() // 1_000_000_000
+    if sec != _now_iso_cache[0]:
+        _now_iso_cache = (sec, dt.datetime.fromtimestamp(sec, UTC).isoformat())
+    return _now_iso_cache[1]
 
 
 def should_notify_state_change(
-    history: list[str], prev_notified: str | None, curr_state: str
-) -> tuple[bool, list[str]]:
+    history: deque[str], prev_notified: str | None, curr_state: str
+) -> bool:
     """
     Determine if a precipitation state change should trigger a notification.
 
@@ -116,43 +289,28 @@ def should_notify_state_change(
     API flaps between states.
 
     Args:
-        history: List of recent precipitation states (max 2).
+        history: Recent precipitation states, a ``deque(maxlen=2)`` that is
+            updated in place with *curr_state*.
         prev_notified: Last state that triggered a notification.
         curr_state: Current precipitation state.
 
     Returns:
-        Tuple of (should_notify, new_history):
-        - should_notify: True if notification should be sent.
-        - new_history: Updated history list (limited to last 2 states).
+        True if notification should be sent.
 
     Logic:
-        - Append current state to history
-        - Keep only last 2 states
+        - Append current state to history (the deque keeps the last 2)
         - Notify only if:
             1. Current state != last notified state (actual change)
             2. Current state is stable (appears in last 2 observations)
     """
-    # Append current state to history
-    new_history = history + [curr_state]
-
-    # Keep only last 2 states (sliding window)
-    if len(new_history) > 2:
-        new_history = new_history[-2:]
+    history.append(curr_state)
 
     # Need at least 2 observations to confirm stability
-    if len(new_history) < 2:
-        return (False, new_history)
-
-    # Check if current state is stable (last 2 states match)
-    is_stable = new_history[-1] == new_history[-2]
-
-    # Check if current state is different from last notified
-    is_different = curr_state != prev_notified
-
-    # Notify only if stable AND different
-    should_notify = is_stable and is_different
+    if len(history) < 2:
+        return False
 
-    return (should_notify, new_history)
+    # Notify only if stable (last 2 states match) AND different from last notified
+    return history[0] == history[1] and curr_state != prev_notified
 
 
 def should_suppress_landing_notification(
@@ -189,40 +347,44 @@ def should_suppress_landing_notification(
 
 
 def _maybe_send_thunderstorm_notification(
-    app: FastAPI, precip: dict, coords: dict
+    app: FastAPI, precip: dict, coords: dict, now: dt.datetime | None = None
 ) -> None:
     """
     Send state-change + severity thunderstorm notifications.
 
     Args:
-        app: FastAPI app instance (for state tracking).
+        app: FastAPI app instance; ``_init_prev_raining`` initialises the
+            ``prev_thunderstorm_state`` / ``thunderstorm_last_notified`` state.
         precip: Result from get_precip() (includes thunderstorm_state).
         coords: Current location coordinates.
+        now: Tick timestamp (defaults to the current UTC time).
     """
     curr_state = precip.get("thunderstorm_state", "none")
-    prev_state = getattr(app.state, "prev_thunderstorm_state", "none")
+    st = app.state
+    prev_state = st.prev_thunderstorm_state
 
     # No state change - nothing to do
     if curr_state == prev_state:
         return
 
     location = coords.get("name", "Trump's location")
-    now = dt.datetime.now(UTC)
-    last_notified = getattr(app.state, "thunderstorm_last_notified", {})
+    if now is None:
+        now = dt.datetime.now(UTC)
+    last_notified = st.thunderstorm_last_notified
 
     # Determine transition and check if we should notify
-    transition = f"{prev_state}->{curr_state}"
+    transition = (prev_state, curr_state)
+    entry = THUNDERSTORM_COOLDOWNS.get(transition)
 
-    if transition in THUNDERSTORM_COOLDOWNS:
-        cooldown, msg_template = THUNDERSTORM_COOLDOWNS[transition]
+    if entry is not None:
+        cooldown, msg_template = entry
         last = last_notified.get(transition)
         cooldown_ok = last is None or (now - last).total_seconds() > cooldown
 
         if cooldown_ok:
             message = msg_template.format(location=location)
-            broadcast("Thunderstorm Alert", message)
+            _dispatch_broadcast("Thunderstorm Alert", message)
             last_notified[transition] = now
-            app.state.thunderstorm_last_notified = last_notified
             LOG_BG.info(
                 "[thunderstorm] Notified: %s -> %s: %s",
                 prev_state,
@@ -231,7 +393,7 @@ def _maybe_send_thunderstorm_notification(
             )
 
     # Always update state after processing
-    app.state.prev_thunderstorm_state = curr_state
+    st.prev_thunderstorm_state = curr_state
 
 
 # ---------------------------------------------------------------------
@@ -247,10 +409,10 @@ async def lifespan(app: FastAPI):  # noqa: N802 – FastAPI naming style
         app.state.prev_precip_type = None
         app.state.prev_thunderstorm_state = "none"  # Thunderstorm state tracking
         app.state.thunderstorm_last_notified = {}  # Thunderstorm cooldown tracking
-        app.state.precip_history = []
+        app.state.precip_history = deque(maxlen=2)
         app.state.was_in_flight = False
 
-        coords = await _unwrap(current_coords())
+        coords = await current_coords()
 
         # A) Still unknown → leave sentinel so loop keeps trying
         if not coords or coords.get("unknown") or "lat" not in coords:
@@ -260,31 +422,39 @@ async def lifespan(app: FastAPI):  # noqa: N802 – FastAPI naming style
         if coords.get("in_flight"):
             app.state.prev_precip_type = "none"
             app.state.prev_thunderstorm_state = "none"
-            app.state.precip_history = []  # Reset history when in flight
+            app.state.precip_history.clear()  # Reset history when in flight
             app.state.was_in_flight = True
             return
 
-        precip = await _unwrap(get_precip(coords["lat"], coords["lon"]))
+        precip = await get_precip(coords["lat"], coords["lon"])
         app.state.prev_precip_type = precip["precipitation_type"]
         app.state.prev_thunderstorm_state = precip.get("thunderstorm_state", "none")
 
-    async def _check_and_notify() -> None:
-        """Run every minute – send a push if precipitation state changes."""
-        LOG_BG.info("[loop] tick")
-        coords = await _unwrap(current_coords())
-        LOG_BG.info("[loop] coords %s", coords)
+    async def _check_and_notify() -> bool:
+        """
+        Run every poll – send a push if precipitation state changes.
+
+        Returns False when no reading was taken (unknown location or a
+        weather API error), True otherwise.
+        """
+        LOG_BG.debug("[loop] tick")
+        st = app.state
+        now = dt.datetime.now(UTC)
+        coords = await current_coords()
+        LOG_BG.debug("[loop] coords %s", coords)
         if not coords or "lat" not in coords:
-            return  # still unknown
+            return False  # still unknown
         if coords.get("in_flight"):
-            app.state.prev_precip_type = "none"
-            app.state.precip_history = []  # Reset history when in flight
-            app.state.was_in_flight = True  # Track that we were in flight
-            return
+            st.prev_precip_type = "none"
+            st.precip_history.clear()  # Reset history when in flight
+            st.was_in_flight = True  # Track that we were in flight
+            st.latest_reading = (time.monotonic(), coords, None)
+            return True
 
         # Check if we just landed (transitioning from in-flight to ground)
-        was_in_flight = getattr(app.state, "was_in_flight", False)
+        was_in_flight = st.was_in_flight
 
-        precip = await _unwrap(get_precip(coords["lat"], coords["lon"]))
+        precip = await get_precip(coords["lat"], coords["lon"])
 
         # Handle weather API errors - skip notification but log
         if precip.get("error"):
@@ -292,146 +462,114 @@ async def lifespan(app: FastAPI):  # noqa: N802 – FastAPI naming style
                 "[loop] Weather API error: %s - skipping notification check",
                 precip.get("reason"),
             )
-            return  # Keep previous state, retry next cycle
+            return False  # Keep previous state, retry next cycle
+
+        # Share this reading with /is_it_raining.json
+        st.latest_reading = (time.monotonic(), coords, precip)
 
-        prev_type = getattr(app.state, "prev_precip_type", None)
+        prev_type = st.prev_precip_type
         curr_type = precip["precipitation_type"]
 
-        LOG_BG.info(
-            "[loop] precip_type=%s prev=%s (rain=%.1fmm/h snow=%.1fcm/h)",
-            curr_type,
-            prev_type,
-            precip["rain"],
-            precip["snow"],
-        )
+        # One INFO line per tick; everything else in the loop is DEBUG
         LOG.info(
-            "[loop] coords=%s precip_type=%s prev=%s",
+            "[loop] coords=%s precip_type=%s prev=%s (rain=%.1fmm/h snow=%.1fcm/h)",
             coords.get("name"),
             curr_type,
             prev_type,
+            precip["rain"],
+            precip["snow"],
         )
 
-        # Check if notification should be sent
-        if DEBOUNCE_NOTIFICATIONS:
-            # Debouncing: require 2 consecutive checks with same state
-            history = getattr(app.state, "precip_history", [])
-            should_notify, new_history = should_notify_state_change(
-                history, prev_type, curr_type
-            )
-            app.state.precip_history = new_history
+        # Unchanged state (the common case) can't notify without debouncing:
+        # skip the decision logic and go straight to thunderstorm + snapshot.
+        if curr_type == prev_type and not DEBOUNCE_NOTIFICATIONS:
+            should_notify = False
+            st.was_in_flight = False
         else:
-            # No debouncing: notify immediately on state change
-            should_notify = prev_type is not None and curr_type != prev_type
+            # Check if notification should be sent
+            if DEBOUNCE_NOTIFICATIONS:
+                # Debouncing: require 2 consecutive checks with same state
+                should_notify = should_notify_state_change(
+                    st.precip_history, prev_type, curr_type
+                )
+            else:
+                # No debouncing: notify immediately on state change
+                should_notify = prev_type is not None and curr_type != prev_type
 
-        # Check if we should suppress due to just landing
-        suppress_landing = should_suppress_landing_notification(
-            was_in_flight, prev_type, curr_type
-        )
+            # Check if we should suppress due to just landing
+            suppress_landing = should_suppress_landing_notification(
+                was_in_flight, prev_type, curr_type
+            )
 
-        LOG_BG.info(
-            "[loop] should_notify=%s suppress_landing=%s was_in_flight=%s debounce=%s",
-            should_notify,
-            suppress_landing,
-            was_in_flight,
-            DEBOUNCE_NOTIFICATIONS,
-        )
+            LOG_BG.debug(
+                "[loop] should_notify=%s suppress_landing=%s "
+                "was_in_flight=%s debounce=%s",
+                should_notify,
+                suppress_landing,
+                was_in_flight,
+                DEBOUNCE_NOTIFICATIONS,
+            )
 
-        # Clear the was_in_flight flag after first ground check
-        app.state.was_in_flight = False
+            # Clear the was_in_flight flag after first ground check
+            st.was_in_flight = False
 
         # Send notification if state change is stable
         # Special handling for landing in precipitation
         # (different message, not suppressed)
         if should_notify:
-            location = coords["name"]
-
             # Check if this is a landing-in-precipitation scenario
             if suppress_landing:
                 # Trump just landed in precipitation - send accurate message
-                title = "Trump Landed"
-                if curr_type == "rain":
-                    message = f"Trump just landed at {location} - it's raining there!"
-                elif curr_type == "snow":
-                    message = f"Trump just landed at {location} - it's snowing there!"
-                elif curr_type == "both":
-                    message = (
-                        f"Trump just landed at {location} - rain and snow falling!"
-                    )
-                else:
+                entry = LANDING_TRANSITIONS.get(curr_type)
+                if entry is None:
                     # Landing in clear weather - no notification needed
-                    app.state.prev_precip_type = curr_type
-                    return
-
-            # Normal transitions (not landing)
-            elif prev_type == "none" and curr_type == "rain":
-                title = "It's Raining!"
-                message = f"It just started raining at {location}!"
-            elif prev_type == "none" and curr_type == "snow":
-                title = "It's Snowing!"
-                message = f"It just started snowing at {location}!"
-            elif prev_type == "none" and curr_type == "both":
-                title = "Rain & Snow!"
-                message = f"It just started raining and snowing at {location}!"
-            elif curr_type == "none":
-                # Stopped precipitating (was rain, snow, or both)
-                title = "Weather Update"
-                if prev_type == "rain":
-                    message = f"It stopped raining at {location}."
-                elif prev_type == "snow":
-                    message = f"It stopped snowing at {location}."
-                else:  # was "both"
-                    message = f"Precipitation stopped at {location}."
+                    st.prev_precip_type = curr_type
+                    return True
             else:
-                # Transition between precipitation types with specific messages
-                if prev_type == "rain" and curr_type == "snow":
-                    title = "It's Snowing!"
-                    message = f"Rain turned to snow at {location}!"
-                elif prev_type == "snow" and curr_type == "rain":
-                    title = "It's Raining!"
-                    message = f"Snow turned to rain at {location}!"
-                elif prev_type == "rain" and curr_type == "both":
-                    title = "Rain & Snow!"
-                    message = f"Now it's raining AND snowing at {location}!"
-                elif prev_type == "snow" and curr_type == "both":
-                    title = "Rain & Snow!"
-                    message = f"Rain started - now both rain and snow at {location}!"
-                elif prev_type == "both" and curr_type == "rain":
-                    title = "It's Raining!"
-                    message = f"Snow stopped - just rain now at {location}."
-                elif prev_type == "both" and curr_type == "snow":
-                    title = "It's Snowing!"
-                    message = f"Rain stopped - just snow now at {location}."
-                else:
-                    # Catch-all for unexpected transitions
-                    title = "Weather Update"
-                    message = f"Precipitation changed to {curr_type} at {location}!"
-
-            broadcast(title, message)
+                # Normal transitions (not landing)
+                entry = PRECIP_TRANSITIONS.get(
+                    (prev_type, curr_type),
+                    _PRECIP_STOPPED if curr_type == "none" else _PRECIP_CHANGED,
+                )
+            title, template = entry
+            # One context feeds the message template, the log and the event
+            ctx = {
+                "loc": coords["name"],
+                "prev": prev_type or "unknown",
+                "curr": curr_type,
+                "rain": precip.get("rain", 0.0),
+                "snow": precip.get("snow", 0.0),
+            }
+            message = template.format_map(ctx)
+
+            LOG.info("[loop] notify %s -> %s: %s", ctx["prev"], curr_type, message)
+            _dispatch_broadcast(title, message)
 
             # Emit Discord event for rain state change
             emit_rain_state_changed(
-                was=prev_type or "unknown",
+                was=ctx["prev"],
                 now=curr_type,
-                location=location,
-                rain_mmh=precip.get("rain", 0.0),
-                snow_cmh=precip.get("snow", 0.0),
+                location=ctx["loc"],
+                rain_mmh=ctx["rain"],
+                snow_cmh=ctx["snow"],
             )
 
             # Update last notified state
-            app.state.prev_precip_type = curr_type
+            st.prev_precip_type = curr_type
 
         # ── Thunderstorm check ────────────────────────────────────────
         # Check for thunderstorm state changes (independent of precipitation)
-        LOG_BG.info(
+        LOG_BG.debug(
             "[loop] thunderstorm=%s state=%s",
             precip.get("thunderstorm", False),
             precip.get("thunderstorm_state", "none"),
         )
-        _maybe_send_thunderstorm_notification(app, precip, coords)
+        _maybe_send_thunderstorm_notification(app, precip, coords, now)
 
         # ── Capture debug snapshot ────────────────────────────────────
         # Store current state for historical debugging
-        add_snapshot(coords=coords, precip=precip)
+        add_snapshot(coords=coords, precip=precip, now=now)
+        return True
 
     try:
         await _init_prev_raining()
@@ -442,16 +580,45 @@ async def lifespan(app: FastAPI):  # noqa: N802 – FastAPI naming style
     # Enable Discord events now that initial state is set
     mark_initialization_complete()
 
+    stop = asyncio.Event()
+
     async def _loop() -> None:
-        while True:
+        stable_cycles = 0
+        last_sig = None
+        while not stop.is_set():
             try:
-                await _check_and_notify()
+                completed = await _check_and_notify()
             except Exception as exc:
                 LOG.error("[loop] crashed: %s", exc, exc_info=True)
-            # 5 min polling interval. With DEBOUNCE_NOTIFICATIONS=False,
-            # notifications trigger on first detection.
-            # Set DEBOUNCE_NOTIFICATIONS=True if spam occurs.
-            await asyncio.sleep(300)
+                completed = False
+
+            # Only completed readings count as stable: a failed tick leaves
+            # the state untouched, and an outage must keep the base rate.
+            st = app.state
+            if completed:
+                latest = st.latest_reading
+                sig = (
+                    latest[1].get("name") if latest else None,
+                    st.was_in_flight,
+                    st.prev_precip_type,
+                    st.prev_thunderstorm_state,
+                )
+                stable_cycles = stable_cycles + 1 if sig == last_sig else 0
+                last_sig = sig
+            else:
+                stable_cycles, last_sig = 0, None
+            try:
+                subscribed = await asyncio.to_thread(has_subscriptions)
+            except Exception as exc:
+                LOG.warning("[loop] could not read subscriptions: %s", exc)
+                subscribed = True
+            interval = _poll_interval(stable_cycles, subscribed)
+
+            # With DEBOUNCE_NOTIFICATIONS=False, notifications trigger on
+            # first detection. Set DEBOUNCE_NOTIFICATIONS=True if spam occurs.
+            # The wait is cut short when shutdown sets ``stop``.
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(stop.wait(), timeout=interval)
 
     task = asyncio.create_task(_loop())
     app.state.check_and_notify = _check_and_notify  # type: ignore[attr-defined]
@@ -461,16 +628,26 @@ async def lifespan(app: FastAPI):  # noqa: N802 – FastAPI naming style
 
     yield  # ⇢ application runs here
 
-    # Shutdown: stop polling loop
-    task.cancel()
-    with contextlib.suppress(asyncio.CancelledError):
-        await task
+    # Shutdown: let the loop exit on its own; a check still in progress is
+    # given a few seconds before wait_for cancels it.
+    stop.set()
+    with contextlib.suppress(asyncio.TimeoutError):
+        await asyncio.wait_for(task, timeout=10)
+    await aclose_http_client()
+    await aclose_weather_client()
 
 
 # ---------------------------------------------------------------------
 # FastAPI instance & middleware
 # ---------------------------------------------------------------------
-app = FastAPI(title="Is It Raining on Trump?", lifespan=lifespan)
+app = FastAPI(
+    title="Is It Raining on Trump?",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+# Latest (monotonic ts, coords, precip) from the polling loop; precip is
+# None while in flight. Read by /is_it_raining.json while fresh.
+app.state.latest_reading = None
 
 # Rate limiter state
 app.state.limiter = limiter
@@ -497,6 +674,8 @@ app.add_middleware(
     allow_origins=ALLOWED_ORIGINS,
     allow_methods=["GET", "POST", "DELETE", "PATCH", "OPTIONS"],
     allow_headers=["*"],
+    # Let browsers reuse a preflight for 24h instead of re-sending OPTIONS
+    max_age=86400,
 )
 
 
@@ -525,7 +704,7 @@ async def healthz() -> PlainTextResponse:
 # Routes
 # ---------------------------------------------------------------------
 @app.get("/plane_state.json")
-async def plane_state() -> JSONResponse:
+async def plane_state() -> ORJSONResponse:
     """
     Return the freshest aircraft state plus feed-level errors (if any).
 
@@ -534,84 +713,68 @@ async def plane_state() -> JSONResponse:
     raw = get_plane_state()
 
     # Unpack the error envelope shape `{"state": …, "errors":[…]}`
-    errors = raw.get("errors", []) if isinstance(raw, dict) else []
-    state = raw["state"] if isinstance(raw, dict) and "state" in raw else raw
+    if raw.__class__ is dict:
+        errors = raw.get("errors", ())
+        state = raw.get("state", raw)
+    else:
+        errors, state = (), raw
 
     source = "opensky" if state and not errors else "adsbfi" if state else "none"
     payload: dict[str, Any] = {"source": source, "state": state}
     if errors:
         payload["errors"] = errors
-    return JSONResponse(content=jsonable_encoder(payload))
+    # orjson serialises the datetime fields natively – no jsonable_encoder walk
+    return ORJSONResponse(payload)
 
 
 @app.get("/is_it_raining.json")
 async def is_it_raining(
     lat: float | None = Query(None),
     lon: float | None = Query(None),
-) -> JSONResponse:
+) -> ORJSONResponse:
     """Machine-readable answer to the titular question."""
+    precip: dict[str, Any] | None = None
+    latest = app.state.latest_reading
+    fresh = (
+        latest is not None and time.monotonic() - latest[0] < LATEST_READING_MAX_AGE_S
+    )
     if lat is not None and lon is not None:
         coords = {"lat": lat, "lon": lon, "name": f"({lat:.2f},{lon:.2f})"}
+    elif fresh:
+        # The polling loop just resolved both – reuse them
+        _, coords, precip = latest
     else:
-        coords = await _unwrap(current_coords())
+        coords = await current_coords()
+
+    now = now_iso()
 
     # A) Plane in flight → always not raining, no thunderstorm
     if coords.get("in_flight"):
-        return JSONResponse(
-            {
-                "precipitating": False,
-                "mmh": 0.0,
-                "precipitation_type": "none",
-                "snow": 0.0,
-                "thunderstorm": False,
-                "thunderstorm_state": "none",
-                "sunrise": None,
-                "sunset": None,
-                "coords": coords,
-                "timestamp": dt.datetime.now(UTC).isoformat(),
-            }
-        )
+        payload = _INFLIGHT_PAYLOAD.copy()
+        payload["coords"] = coords
+        payload["timestamp"] = now
+        return ORJSONResponse(payload)
 
     # B) Unknown location → unable to answer
     if coords.get("unknown"):
-        return JSONResponse(
-            {
-                "precipitating": None,
-                "mmh": None,
-                "precipitation_type": None,
-                "snow": None,
-                "thunderstorm": None,
-                "thunderstorm_state": None,
-                "sunrise": None,
-                "sunset": None,
-                "coords": coords,
-                "timestamp": dt.datetime.now(UTC).isoformat(),
-            }
-        )
+        payload = _UNKNOWN_PAYLOAD.copy()
+        payload["coords"] = coords
+        payload["timestamp"] = now
+        return ORJSONResponse(payload)
 
     # C) Normal lat/lon - check weather
-    precip = await _unwrap(get_precip(coords["lat"], coords["lon"]))
+    if precip is None:
+        precip = await get_precip(coords["lat"], coords["lon"])
 
     # Handle weather API errors
     if precip.get("error"):
-        return JSONResponse(
-            {
-                "precipitating": None,
-                "mmh": None,
-                "precipitation_type": None,
-                "snow": None,
-                "thunderstorm": None,
-                "thunderstorm_state": None,
-                "sunrise": None,
-                "sunset": None,
-                "coords": coords,
-                "error": precip.get("reason", "Weather API error"),
-                "timestamp": dt.datetime.now(UTC).isoformat(),
-            },
-            status_code=503,  # Service Unavailable
-        )
+        payload = _UNKNOWN_PAYLOAD.copy()
+        payload["coords"] = coords
+        payload["error"] = precip.get("reason", "Weather API error")
+        payload["timestamp"] = now
+        return ORJSONResponse(payload, status_code=503)  # Service Unavailable
 
-    return JSONResponse(
+    return ORJSONResponse(
         {
             "precipitating": precip["precipitating"],
             "mmh": precip.get("rain", 0.0),
@@ -622,7 +785,7 @@ async def is_it_raining(
             "sunrise": precip.get("sunrise"),
             "sunset": precip.get("sunset"),
             "coords": coords,
-            "timestamp": dt.datetime.now(UTC).isoformat(),
+            "timestamp": now,
         }
     )
 
@@ -634,7 +797,7 @@ async def subscribe(sub: dict, request: Request) -> dict[str, Any]:
 
     Returns preferences on success for client-side caching.
     """
-    result = add_subscription(sub)
+    result = await asyncio.to_thread(add_subscription, sub)
     if not result.get("ok"):
         raise HTTPException(
             status_code=400,
@@ -662,7 +825,7 @@ async def unsubscribe(body: dict, request: Request) -> dict[str, bool]:
     if not endpoint:
         raise HTTPException(status_code=400, detail="endpoint required")
 
-    success = remove_subscription(endpoint)
+    success = await asyncio.to_thread(remove_subscription, endpoint)
     if not success:
         raise HTTPException(status_code=404, detail="Subscription not found")
     return {"ok": True}
@@ -695,29 +858,25 @@ async def update_preferences_route(body: dict, request: Request) -> dict[str, An
         if key in preferences and not isinstance(preferences[key], bool):
             raise HTTPException(status_code=400, detail=f"{key} must be boolean")
 
-    result = update_preferences(endpoint, preferences)
+    result = await asyncio.to_thread(update_preferences, endpoint, preferences)
     if result is None:
         raise HTTPException(status_code=404, detail="Subscription not found")
 
     return {"ok": True, "preferences": result}
 
 
-@app.post("/broadcast")
+@app.post("/broadcast", dependencies=[Depends(require_admin_token)])
 async def broadcast_route(
     msg: str = Query(...),
-    token: str = Query(...),
     notification_type: str | None = Query(None, description="Filter by type: rain_start, rain_stop, thunderstorm_start, thunderstorm_end"),
 ) -> dict[str, Any]:
     """Manually broadcast a push notification (protected by a token)."""
-    if not secrets.compare_digest(token.strip(), BROADCAST_TOKEN.strip()):
-        raise HTTPException(status_code=403, detail="Forbidden")
-    sent_count = broadcast("Rain on Trump", msg, notification_type=notification_type)
+    sent_count = await _broadcast_async("Rain on Trump", msg, notification_type)
     return {"ok": True, "message": msg, "sent_count": sent_count, "notification_type": notification_type}
 
 
-@app.post("/cleanup_subscriptions")
+@app.post("/cleanup_subscriptions", dependencies=[Depends(require_admin_token)])
 async def cleanup_subscriptions_route(
-    token: str = Query(...),
     max_days: int = Query(365),
 ) -> dict[str, Any]:
     """
@@ -727,17 +886,17 @@ async def cleanup_subscriptions_route(
     NEVER received a notification (last_delivery is absent).
 
     Args:
-        token: Admin token (must match BROADCAST_TOKEN).
+        token: Admin token query param (checked by ``require_admin_token``).
         max_days: Maximum age in days for never-delivered subscriptions (default: 365).
 
     Returns:
         Dict with cleanup results.
     """
-    if not secrets.compare_digest(token.strip(), BROADCAST_TOKEN.strip()):
-        raise HTTPException(status_code=403, detail="Forbidden")
-
-    removed_count = cleanup_old_subscriptions(max_days=max_days)
-    stats = get_subscription_stats()
+    # File I/O runs off the event loop; stats must follow the cleanup
+    removed_count = await asyncio.to_thread(
+        cleanup_old_subscriptions, max_days=max_days
+    )
+    stats = await asyncio.to_thread(get_subscription_stats)
 
     return {
         "ok": True,
@@ -747,213 +906,132 @@ async def cleanup_subscriptions_route(
     }
 
 
-@app.get("/subscription_stats")
-async def subscription_stats_route(
-    token: str = Query(...),
-) -> dict[str, Any]:
+@app.get("/subscription_stats", dependencies=[Depends(require_admin_token)])
+async def subscription_stats_route() -> dict[str, Any]:
     """
     Get statistics about push subscriptions.
 
     Protected by BROADCAST_TOKEN.
 
     Args:
-        token: Admin token (must match BROADCAST_TOKEN).
+        token: Admin token query param (checked by ``require_admin_token``).
 
     Returns:
         Dict with subscription statistics.
     """
-    if not secrets.compare_digest(token.strip(), BROADCAST_TOKEN.strip()):
-        raise HTTPException(status_code=403, detail="Forbidden")
-
-    stats = get_subscription_stats()
+    stats = await asyncio.to_thread(get_subscription_stats)
     return {"ok": True, "stats": stats}
 
 
 # ---------------------------------------------------------------------
 # Debug helpers
 # ---------------------------------------------------------------------
-@app.get("/debug", response_class=HTMLResponse)
-async def debug() -> HTMLResponse:
-    """Human-readable trace for quick manual inspection."""
-    _loc_cache.clear()
-    _weather_cache.clear()
-
-    coords, loc_trace = await current_coords(trace=[])
-    if coords.get("in_flight"):
-        precip = {"precipitating": False}
-        weather_trace = [
-            {
-                "ts": dt.datetime.now(UTC).isoformat(),
-                "phase": "weather",
-                "step": "skipped – in flight",
-            }
-        ]
-    elif coords.get("unknown") or "lat" not in coords:
-        precip = {"precipitating": None}
-        weather_trace = [
-            {
-                "ts": dt.datetime.now(UTC).isoformat(),
-                "phase": "weather",
-                "step": "skipped – unknown location",
-            }
-        ]
-    else:
-        precip, weather_trace = await get_precip(coords["lat"], coords["lon"], trace=[])
+class _DebugJSONResponse(ORJSONResponse):
+    """ORJSONResponse that treats naive datetimes in traces as UTC."""
 
-    now = dt.datetime.now(UTC).isoformat()
-    answer = "🌧️ YES" if precip["precipitating"] else "☀️ NO"
-
-    html_parts = [
-        "<!doctype html><html lang='en'><head><meta charset='utf-8'>",
-        "<title>Debug Trace</title>",
-        "<style>body{font-family:system-ui,sans-serif;padding:1rem;} "
-        "ul{padding-left:1.2rem;} code{background:#f4f4f4;padding:.2rem;"
-        "display:block;margin:.2rem 0;}</style>",
-        "</head><body>",
-        f"<h1>Debug Trace</h1><p><strong>Run at:</strong> {now}</p>",
-        "<h2>Location Steps</h2><ul>",
-        *[f"<li><code>{step}</code></li>" for step in loc_trace],
-        "</ul><h2>Weather Steps</h2><ul>",
-        *[f"<li><code>{step}</code></li>" for step in weather_trace],
-        "</ul>",
-        f"<p><strong>Final answer:</strong> {answer} at {coords.get('name')}</p>",
-        "</body></html>",
-    ]
-    return HTMLResponse("\n".join(html_parts))
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC
+        )
 
 
-@app.get("/debug.json")
-async def debug_json() -> JSONResponse:  # noqa: D401
-    """Machine-readable debug trace (used by `frontend/debug.html`)."""
-    _loc_cache.clear()
-    _weather_cache.clear()
+# Static shell of the /debug page; only the trace lists vary per request.
+_DEBUG_HEAD = (
+    "<!doctype html><html lang='en'><head><meta charset='utf-8'>"
+    "<title>Debug Trace</title>"
+    "<style>body{font-family:system-ui,sans-serif;padding:1rem;} "
+    "ul{padding-left:1.2rem;} code{background:#f4f4f4;padding:.2rem;"
+    "display:block;margin:.2rem 0;}</style>"
+    "</head><body><h1>Debug Trace</h1>"
+)
 
-    coords, loc_trace = await current_coords(trace=[])
 
-    # Handle the three possible situations ➜ precip + weather_trace
+async def _debug_weather(coords: dict, ts: str) -> tuple[dict, list[dict]]:
+    """Precip + weather trace for the debug pages, every step stamped *ts*."""
     if coords.get("in_flight"):
-        precip = {"precipitating": False}
-        weather_trace = [
-            {
-                "ts": dt.datetime.now(UTC).isoformat(),
-                "phase": "weather",
-                "step": "skipped – in flight",
-            }
-        ]
-    elif coords.get("unknown") or "lat" not in coords or "lon" not in coords:
-        precip = {"precipitating": None}
-        weather_trace = [
-            {
-                "ts": dt.datetime.now(UTC).isoformat(),
-                "phase": "weather",
-                "step": "skipped – unknown location",
-            }
-        ]
-    else:
-        precip, weather_trace = await get_precip(coords["lat"], coords["lon"], trace=[])
-
-    def _serialise(obj: Any) -> Any:
-        """Recursively convert datetimes → ISO 8601 strings for JSON."""
-        if isinstance(obj, dt.datetime):
-            return obj.isoformat()
-        if isinstance(obj, list):
-            return [_serialise(v) for v in obj]
-        if isinstance(obj, dict):
-            return {k: _serialise(v) for k, v in obj.items()}
-        return obj
+        step = "skipped – in flight"
+        return {"precipitating": False}, [{"ts": ts, "phase": "weather", "step": step}]
+    if coords.get("unknown") or "lat" not in coords or "lon" not in coords:
+        step = "skipped – unknown location"
+        return {"precipitating": None}, [{"ts": ts, "phase": "weather", "step": step}]
+    return await get_precip_with_trace(coords["lat"], coords["lon"], ts=ts)
 
-    return JSONResponse(
-        {
-            "coords": _serialise(coords),
-            "loc_trace": _serialise(loc_trace),
-            "precip": _serialise(precip),
-            "weather_trace": _serialise(weather_trace),
-        }
-    )
 
+@app.get("/debug", response_class=HTMLResponse)
+async def debug() -> HTMLResponse:
+    """Human-readable trace for quick manual inspection."""
+    now = now_iso()
+    coords, loc_trace = await current_coords_with_trace()
+    precip, weather_trace = await _debug_weather(coords, now)
+    answer = "🌧️ YES" if precip["precipitating"] else "☀️ NO"
 
-@app.get("/debug/history.json")
-async def debug_history_json(
-    limit: int = Query(50, ge=1, le=500),
-    since_hours: float | None = Query(None, ge=0.1, le=168),
-) -> JSONResponse:
-    """
-    Retrieve historical debug snapshots.
+    loc_html = "".join(
+        f"<li><code>{escape(str(step))}</code></li>" for step in loc_trace
+    )
+    weather_html = "".join(
+        f"<li><code>{escape(str(step))}</code></li>" for step in weather_trace
+    )
+    return HTMLResponse(
+        f"{_DEBUG_HEAD}<p><strong>Run at:</strong> {now}</p>"
+        f"<h2>Location Steps</h2><ul>{loc_html}"
+        f"</ul><h2>Weather Steps</h2><ul>{weather_html}</ul>"
+        f"<p><strong>Final answer:</strong> {answer} at "
+        f"{escape(str(coords.get('name')))}</p></body></html>"
+    )
 
-    Args:
-        limit: Maximum number of snapshots to return (default: 50, max: 500).
-        since_hours: Only return snapshots from the last N hours (max: 168 = 7 days).
 
-    Returns:
-        JSON with snapshots array and statistics.
-    """
-    snapshots = get_snapshots(limit=limit, since_hours=since_hours)
-    stats = get_snapshot_stats()
+@app.get("/debug.json")
+async def debug_json() -> _DebugJSONResponse:  # noqa: D401
+    """Machine-readable debug trace (used by `frontend/debug.html`)."""
+    coords, loc_trace = await current_coords_with_trace()
+    precip, weather_trace = await _debug_weather(coords, now_iso())
 
-    return JSONResponse(
+    # orjson encodes the trace datetimes itself – no Python-level walk
+    return _DebugJSONResponse(
         {
-            "snapshots": snapshots,
-            "stats": stats,
-            "query": {"limit": limit, "since_hours": since_hours},
+            "coords": coords,
+            "loc_trace": loc_trace,
+            "precip": precip,
+            "weather_trace": weather_trace,
         }
     )
 
 
-@app.get("/debug/history", response_class=HTMLResponse)
-async def debug_history(
-    limit: int = Query(20, ge=1, le=100),
-) -> HTMLResponse:
-    """Human-readable view of recent debug snapshots."""
-    snapshots = get_snapshots(limit=limit)
-    stats = get_snapshot_stats()
+# The store sequence restarts at 0 with the process, so ETags carry a
+# per-process salt to keep a pre-restart ETag from matching new content.
+_ETAG_SALT = secrets.token_hex(4)
 
-    rows = []
-    for snap in snapshots:
-        ts = snap.get("ts", "?")
-        coords = snap.get("coords", {})
-        precip = snap.get("precip", {})
-
-        location = coords.get("name", "Unknown")
-        reason = coords.get("reason", "?")
-        confidence = coords.get("confidence", "?")
-        precip_type = precip.get("precipitation_type", "?")
-        rain = precip.get("rain", 0)
-        snow = precip.get("snow", 0)
-
-        rows.append(
-            f"<tr>"
-            f"<td>{ts}</td>"
-            f"<td>{location}</td>"
-            f"<td>{reason}</td>"
-            f"<td>{confidence}</td>"
-            f"<td>{precip_type}</td>"
-            f"<td>{rain:.1f}</td>"
-            f"<td>{snow:.1f}</td>"
-            f"</tr>"
-        )
 
-    html = f"""<!doctype html>
+# Row templates for the debug HTML tables, formatted once per row with %
+_HISTORY_ROW_TMPL = (
+    "<tr><td>%s</td><td>%s</td><td>%s</td><td>%s</td><td>%s</td>"
+    "<td>%.1f</td><td>%.1f</td></tr>"
+)
+_GEOCODE_ROW_TMPL = (
+    "<tr><td>%s</td><td>%s</td><td class='%s'>%s</td><td>%s</td>"
+    "<td>%s</td><td>%s</td></tr>"
+)
+
+
+# Static parts of the /debug/history and /debug/geocode pages; only the
+# stats block, the rows and the ``limit`` in the JSON link vary.
+_HISTORY_HTML_HEAD = """<!doctype html>
 <html lang="en">
 <head>
     <meta charset="utf-8">
     <title>Debug History</title>
     <style>
-        body {{ font-family: system-ui, sans-serif; padding: 1rem; }}
-        table {{ border-collapse: collapse; width: 100%; }}
-        th, td {{ border: 1px solid #ddd; padding: 0.5rem; text-align: left; }}
-        th {{ background: #f4f4f4; }}
-        .stats {{ margin-bottom: 1rem; padding: 1rem; background: #f9f9f9; border-radius: 4px; }}
+        body { font-family: system-ui, sans-serif; padding: 1rem; }
+        table { border-collapse: collapse; width: 100%; }
+        th, td { border: 1px solid #ddd; padding: 0.5rem; text-align: left; }
+        th { background: #f4f4f4; }
+        .stats { margin-bottom: 1rem; padding: 1rem; background: #f9f9f9; border-radius: 4px; }
     </style>
 </head>
 <body>
     <h1>Debug History</h1>
-    <div class="stats">
-        <strong>Snapshots:</strong> {stats.get('count', 0)} |
-        <strong>Oldest:</strong> {stats.get('oldest', 'N/A')} |
-        <strong>Newest:</strong> {stats.get('newest', 'N/A')} |
-        <strong>Retention:</strong> {stats.get('max_age_hours', 168)} hours
-    </div>
-    <table>
+"""
+_HISTORY_TABLE_HEAD = """    <table>
         <thead>
             <tr>
                 <th>Timestamp</th>
@@ -966,15 +1044,184 @@ async def debug_history(
             </tr>
         </thead>
         <tbody>
-            {"".join(rows) if rows else "<tr><td colspan='7'>No snapshots yet</td></tr>"}
+            """
+_HISTORY_HTML_TAIL = """
         </tbody>
     </table>
-    <p><a href="/debug/history.json?limit={limit}">View as JSON</a> |
+    <p><a href="/debug/history.json?limit=%d">View as JSON</a> |
        <a href="/debug/geocode">Geocode Log</a></p>
 </body>
 </html>"""
+_GEOCODE_HTML_HEAD = """<!doctype html>
+<html lang="en">
+<head>
+    <meta charset="utf-8">
+    <title>Geocode Log</title>
+    <style>
+        body { font-family: system-ui, sans-serif; padding: 1rem; }
+        table { border-collapse: collapse; width: 100%; font-size: 0.9rem; }
+        th, td { border: 1px solid #ddd; padding: 0.4rem; text-align: left; }
+        th { background: #f4f4f4; }
+        .stats { margin-bottom: 1rem; padding: 1rem; background: #f9f9f9; border-radius: 4px; }
+        .us { color: #080; }
+        .intl { color: #008; }
+        .fail { color: #d00; font-weight: 600; }
+        .skip { color: #888; }
+        td:nth-child(2) { max-width: 200px; overflow: hidden; text-overflow: ellipsis; }
+    </style>
+</head>
+<body>
+    <h1>Geocode Log</h1>
+"""
+_GEOCODE_TABLE_HEAD = """    <p><a href="/debug/history">← Back to History</a></p>
+    <table>
+        <thead>
+            <tr>
+                <th>Timestamp</th>
+                <th>Query</th>
+                <th>Type</th>
+                <th>Coords</th>
+                <th>Location</th>
+                <th>Error</th>
+            </tr>
+        </thead>
+        <tbody>
+            """
+_GEOCODE_HTML_TAIL = """
+        </tbody>
+    </table>
+    <p><a href="/debug/geocode.json?limit=%d">View as JSON</a> |
+       <a href="/debug/geocode.json?result_type=no_result">Failures only</a> |
+       <a href="/debug/geocode.json?result_type=international">International only</a></p>
+</body>
+</html>"""
+
+# CSS class per geocode result type (color coding in the table)
+_TYPE_CLASS = {
+    "us": "us",
+    "international": "intl",
+    "no_result": "fail",
+    "error": "fail",
+    "skipped": "skip",
+}
+
 
-    return HTMLResponse(html)
+def _history_row(snap: dict[str, Any]) -> str:
+    """One ``/debug/history`` table row; free-text fields are HTML-escaped."""
+    coords = snap.get("coords", {})
+    precip = snap.get("precip", {})
+    return _HISTORY_ROW_TMPL % (
+        snap.get("ts", "?"),
+        escape(str(coords.get("name", "Unknown"))),
+        escape(str(coords.get("reason", "?"))),
+        escape(str(coords.get("confidence", "?"))),
+        escape(str(precip.get("precipitation_type", "?"))),
+        precip.get("rain", 0),
+        precip.get("snow", 0),
+    )
+
+
+def _geocode_row(entry: dict[str, Any]) -> str:
+    """One ``/debug/geocode`` table row; free-text fields are HTML-escaped."""
+    result_type = entry.get("result_type", "?")
+    lat = entry.get("lat")
+    lon = entry.get("lon")
+
+    # Format coordinates
+    coords = f"{lat:.4f}, {lon:.4f}" if lat is not None else "-"
+
+    # Format location
+    state = entry.get("state")
+    country = entry.get("country")
+    location = f"{state}, {country}" if state and country else (state or country or "-")
+
+    return _GEOCODE_ROW_TMPL % (
+        entry.get("ts", "?"),
+        escape(str(entry.get("query", "?"))),
+        _TYPE_CLASS.get(result_type, ""),
+        escape(str(result_type)),
+        coords,
+        escape(location),
+        escape(str(entry.get("error", ""))),
+    )
+
+
+@app.get("/debug/history.json")
+async def debug_history_json(
+    limit: int = Query(50, ge=1, le=500),
+    since_hours: float | None = Query(None, ge=0.1, le=168),
+) -> StreamingResponse:
+    """
+    Retrieve historical debug snapshots.
+
+    Args:
+        limit: Maximum number of snapshots to return (default: 50, max: 500).
+        since_hours: Only return snapshots from the last N hours (max: 168 = 7 days).
+
+    Returns:
+        JSON with snapshots array and statistics.
+    """
+    snapshots = get_snapshots(limit=limit, since_hours=since_hours)
+    stats = get_snapshot_stats()
+    query = {"limit": limit, "since_hours": since_hours}
+
+    # Traces make snapshots large, so encode and send one at a time rather
+    # than materialising the whole body first.
+    async def _body():
+        yield b'{"snapshots":['
+        for i, snap in enumerate(snapshots):
+            if i:
+                yield b","
+            yield orjson.dumps(snap)
+        yield (
+            b'],"stats":'
+            + orjson.dumps(stats)
+            + b',"query":'
+            + orjson.dumps(query)
+            + b"}"
+        )
+
+    return StreamingResponse(_body(), media_type="application/json")
+
+
+@functools.lru_cache(maxsize=8)
+def _render_history_html(version: tuple, limit: int) -> bytes:
+    """Rendered ``/debug/history`` page; *version* only keys the cache."""
+    snapshots = get_snapshots(limit=limit)
+    stats = get_snapshot_stats()
+
+    rows = (
+        "".join(map(_history_row, snapshots))
+        if snapshots
+        else "<tr><td colspan='7'>No snapshots yet</td></tr>"
+    )
+
+    return (
+        _HISTORY_HTML_HEAD
+        + f"""    <div class="stats">
+        <strong>Snapshots:</strong> {stats.get('count', 0)} |
+        <strong>Oldest:</strong> {stats.get('oldest', 'N/A')} |
+        <strong>Newest:</strong> {stats.get('newest', 'N/A')} |
+        <strong>Retention:</strong> {stats.get('max_age_hours', 168)} hours
+    </div>
+"""
+        + _HISTORY_TABLE_HEAD
+        + rows
+        + _HISTORY_HTML_TAIL % limit
+    ).encode()
+
+
+@app.get("/debug/history", response_class=HTMLResponse)
+async def debug_history(
+    request: Request,
+    limit: int = Query(20, ge=1, le=100),
+) -> Response:
+    """Human-readable view of recent debug snapshots."""
+    version = snapshot_store_version()
+    etag = f'W/"snap-{_ETAG_SALT}-{version[0]}-{limit}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return HTMLResponse(_render_history_html(version, limit), headers={"ETag": etag})
 
 
 @app.get("/debug/geocode.json")
@@ -982,7 +1229,7 @@ async def debug_geocode_json(
     limit: int = Query(100, ge=1, le=500),
     since_hours: float | None = Query(None, ge=0.1, le=168),
     result_type: str | None = Query(None),
-) -> JSONResponse:
+) -> ORJSONResponse:
     """
     Retrieve geocode log entries for monitoring and alias curation.
 
@@ -1001,7 +1248,7 @@ async def debug_geocode_json(
     )
     stats = get_geocode_stats()
 
-    return JSONResponse(
+    return ORJSONResponse(
         {
             "entries": entries,
             "stats": stats,
@@ -1014,100 +1261,44 @@ async def debug_geocode_json(
     )
 
 
-@app.get("/debug/geocode", response_class=HTMLResponse)
-async def debug_geocode(
-    limit: int = Query(50, ge=1, le=200),
-) -> HTMLResponse:
-    """Human-readable view of geocode log entries."""
+@functools.lru_cache(maxsize=8)
+def _render_geocode_html(version: tuple, limit: int) -> bytes:
+    """Rendered ``/debug/geocode`` page; *version* only keys the cache."""
     entries = get_geocode_entries(limit=limit)
     stats = get_geocode_stats()
 
-    rows = []
-    for entry in entries:
-        ts = entry.get("ts", "?")
-        query = entry.get("query", "?")
-        result_type = entry.get("result_type", "?")
-        lat = entry.get("lat")
-        lon = entry.get("lon")
-        country = entry.get("country", "")
-        state = entry.get("state", "")
-        error = entry.get("error", "")
-
-        # Format coordinates
-        coords = f"{lat:.4f}, {lon:.4f}" if lat is not None else "-"
-
-        # Format location
-        location = ", ".join(filter(None, [state, country])) or "-"
-
-        # Color code result type
-        type_class = {
-            "us": "us",
-            "international": "intl",
-            "no_result": "fail",
-            "error": "fail",
-            "skipped": "skip",
-        }.get(result_type, "")
-
-        rows.append(
-            f"<tr>"
-            f"<td>{ts}</td>"
-            f"<td>{query}</td>"
-            f"<td class='{type_class}'>{result_type}</td>"
-            f"<td>{coords}</td>"
-            f"<td>{location}</td>"
-            f"<td>{error}</td>"
-            f"</tr>"
-        )
+    rows = (
+        "".join(map(_geocode_row, entries))
+        if entries
+        else "<tr><td colspan='6'>No geocode entries yet</td></tr>"
+    )
 
     # Stats by type
     by_type = stats.get("by_type", {})
     type_summary = " | ".join(f"{k}: {v}" for k, v in sorted(by_type.items()))
 
-    html = f"""<!doctype html>
-<html lang="en">
-<head>
-    <meta charset="utf-8">
-    <title>Geocode Log</title>
-    <style>
-        body {{ font-family: system-ui, sans-serif; padding: 1rem; }}
-        table {{ border-collapse: collapse; width: 100%; font-size: 0.9rem; }}
-        th, td {{ border: 1px solid #ddd; padding: 0.4rem; text-align: left; }}
-        th {{ background: #f4f4f4; }}
-        .stats {{ margin-bottom: 1rem; padding: 1rem; background: #f9f9f9; border-radius: 4px; }}
-        .us {{ color: #080; }}
-        .intl {{ color: #008; }}
-        .fail {{ color: #d00; font-weight: 600; }}
-        .skip {{ color: #888; }}
-        td:nth-child(2) {{ max-width: 200px; overflow: hidden; text-overflow: ellipsis; }}
-    </style>
-</head>
-<body>
-    <h1>Geocode Log</h1>
-    <div class="stats">
+    return (
+        _GEOCODE_HTML_HEAD
+        + f"""    <div class="stats">
         <strong>Total Entries:</strong> {stats.get('count', 0)} |
         <strong>By Type:</strong> {type_summary or 'N/A'} |
         <strong>Retention:</strong> {stats.get('max_age_hours', 168)} hours
     </div>
-    <p><a href="/debug/history">← Back to History</a></p>
-    <table>
-        <thead>
-            <tr>
-                <th>Timestamp</th>
-                <th>Query</th>
-                <th>Type</th>
-                <th>Coords</th>
-                <th>Location</th>
-                <th>Error</th>
-            </tr>
-        </thead>
-        <tbody>
-            {"".join(rows) if rows else "<tr><td colspan='6'>No geocode entries yet</td></tr>"}
-        </tbody>
-    </table>
-    <p><a href="/debug/geocode.json?limit={limit}">View as JSON</a> |
-       <a href="/debug/geocode.json?result_type=no_result">Failures only</a> |
-       <a href="/debug/geocode.json?result_type=international">International only</a></p>
-</body>
-</html>"""
+"""
+        + _GEOCODE_TABLE_HEAD
+        + rows
+        + _GEOCODE_HTML_TAIL % limit
+    ).encode()
+
 
-    return HTMLResponse(html)
+@app.get("/debug/geocode", response_class=HTMLResponse)
+async def debug_geocode(
+    request: Request,
+    limit: int = Query(50, ge=1, le=200),
+) -> Response:
+    """Human-readable view of geocode log entries."""
+    version = geocode_store_version()
+    etag = f'W/"geo-{_ETAG_SALT}-{version[0]}-{limit}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return HTMLResponse(_render_geocode_html(version, limit), headers={"ETag": etag})
@@ -6,61 +6,42 @@ Keys must be **lower-case**, ASCII, and already stripped of fancy dashes
 or NB-spaces; `location_service` does the same sanitisation before lookup.
 """
 
-PLACE_ALIASES: dict[str, dict[str, float | str]] = {
+import sys
+from types import MappingProxyType
+from typing import Mapping
+
+
+def _mk(name: str, lat: float, lon: float) -> Mapping[str, float | str]:
+    """Read-only alias entry; entries built from one coord tuple share floats."""
+    return MappingProxyType({"lat": lat, "lon": lon, "name": name})
+
+
+# White House campus: one shared pair of float objects for every room
+_WH = (38.897676, -77.036529)
+
+PLACE_ALIASES: Mapping[str, Mapping[str, float | str]] = {
     # ─── White House campus (same coords) ──────────────────────────────
-    "the white house": {"lat": 38.897676, "lon": -77.036529, "name": "The White House"},
-    "oval office": {"lat": 38.897676, "lon": -77.036529, "name": "Oval Office, WH"},
-    "roosevelt room": {
-        "lat": 38.897676,
-        "lon": -77.036529,
-        "name": "Roosevelt Room, WH",
-    },
-    "cabinet room": {"lat": 38.897676, "lon": -77.036529, "name": "Cabinet Room, WH"},
-    "east room": {"lat": 38.897676, "lon": -77.036529, "name": "East Room, WH"},
-    "press briefing room": {
-        "lat": 38.897676,
-        "lon": -77.036529,
-        "name": "James S. Brady Briefing Room, WH",
-    },
-    "south lawn": {"lat": 38.897676, "lon": -77.036529, "name": "South Lawn, WH"},
-    "south portico": {"lat": 38.897676, "lon": -77.036529, "name": "South Portico, WH"},
+    "the white house": _mk("The White House", *_WH),
+    "oval office": _mk("Oval Office, WH", *_WH),
+    "roosevelt room": _mk("Roosevelt Room, WH", *_WH),
+    "cabinet room": _mk("Cabinet Room, WH", *_WH),
+    "east room": _mk("East Room, WH", *_WH),
+    "press briefing room": _mk("James S. Brady Briefing Room, WH", *_WH),
+    "south lawn": _mk("South Lawn, WH", *_WH),
+    "south portico": _mk("South Portico, WH", *_WH),
     "the ellipse": {"lat": 38.893758, "lon": -77.035278, "name": "The Ellipse, DC"},
-    "private dining room": {
-        "lat": 38.897676,
-        "lon": -77.036529,
-        "name": "Private Dining Room, WH",
-    },
-    "state dining room": {
-        "lat": 38.897676,
-        "lon": -77.036529,
-        "name": "State Dining Room, WH",
-    },
-    "blue room": {"lat": 38.897676, "lon": -77.036529, "name": "Blue Room, WH"},
-    "red room": {"lat": 38.897676, "lon": -77.036529, "name": "Red Room, WH"},
-    "cross hall": {"lat": 38.897676, "lon": -77.036529, "name": "Cross Hall, WH"},
-    "diplomatic room": {
-        "lat": 38.897676,
-        "lon": -77.036529,
-        "name": "Diplomatic Room, WH",
-    },
-    "grand foyer": {"lat": 38.897676, "lon": -77.036529, "name": "Grand Foyer, WH"},
-    "north portico": {
-        "lat": 38.897676,
-        "lon": -77.036529,
-        "name": "North Portico, WH",
-    },
-    "situation room": {
-        "lat": 38.897676,
-        "lon": -77.036529,
-        "name": "Situation Room, WH",
-    },
+    "private dining room": _mk("Private Dining Room, WH", *_WH),
+    "state dining room": _mk("State Dining Room, WH", *_WH),
+    "blue room": _mk("Blue Room, WH", *_WH),
+    "red room": _mk("Red Room, WH", *_WH),
+    "cross hall": _mk("Cross Hall, WH", *_WH),
+    "diplomatic room": _mk("Diplomatic Room, WH", *_WH),
+    "grand foyer": _mk("Grand Foyer, WH", *_WH),
+    "north portico": _mk("North Portico, WH", *_WH),
+    "situation room": _mk("Situation Room, WH", *_WH),
     # ─── Implicit White House indicators (schedule summaries) ───────────
     # "In-Town Pool Call Time" = press pool must report to White House
-    "in-town pool call time": {
-        "lat": 38.897676,
-        "lon": -77.036529,
-        "name": "The White House",
-    },
+    "in-town pool call time": _mk("The White House", *_WH),
     # ─── Eisenhower Executive Office Building ─────────────────────────
     "south court auditorium": {
         "lat": 38.897592,
@@ -109,11 +90,7 @@ PLACE_ALIASES: dict[str, dict[str, float | str]] = {
         "lon": -77.036106,
         "name": "St. John's Church, Lafayette Square, DC",
     },
-    "the people's house": {
-        "lat": 38.897676,
-        "lon": -77.036529,
-        "name": "The White House",
-    },
+    "the people's house": _mk("The White House", *_WH),
     "rose garden": {"lat": 38.8975, "lon": -77.0371, "name": "Rose Garden, WH"},
     "north lawn": {"lat": 38.8982, "lon": -77.0355, "name": "North Lawn, WH"},
     # ─── DC landmarks that Nominatim misresolves ─────────────────────
@@ -221,3 +198,50 @@ PLACE_ALIASES: dict[str, dict[str, float | str]] = {
         "name": "Dover AFB, DE",
     },
 }
+
+# Freeze the table and intern its keys: it is read-only after import, and
+# exact-match lookups of an interned key can short-circuit on identity.
+PLACE_ALIASES = MappingProxyType(
+    {
+        sys.intern(k): v if isinstance(v, MappingProxyType) else MappingProxyType(v)
+        for k, v in PLACE_ALIASES.items()
+    }
+)
+
+# Same entries ordered longest key first, so substring matching picks the most
+# specific alias ("the white house press briefing room" → Brady Briefing Room,
+# not the generic White House entry). Keys are lower-cased defensively.
+ALIASES_LONGEST_FIRST: tuple[tuple[str, Mapping[str, float | str]], ...] = tuple(
+    sorted(
+        ((key.lower(), alias) for key, alias in PLACE_ALIASES.items()),
+        key=lambda kv: -len(kv[0]),
+    )
+)
+
+# The same order split into parallel key / value tuples: the matcher walks a
+# flat tuple of strings and only index into the values once they have a hit.
+_KEYS_LONGEST_FIRST: tuple[str, ...] = tuple(key for key, _ in ALIASES_LONGEST_FIRST)
+_VALUES_LONGEST_FIRST: tuple[Mapping[str, float | str], ...] = tuple(
+    alias for _, alias in ALIASES_LONGEST_FIRST
+)
+
+
+def find_alias(
+    text: str,
+    _keys: tuple[str, ...] = _KEYS_LONGEST_FIRST,
+    _values: tuple[Mapping, ...] = _VALUES_LONGEST_FIRST,
+) -> Mapping | None:
+    """Return the most specific alias whose key occurs in lower-cased *text*.
+
+    Scans the longest‑first keys (bound as default arguments so the loop
+    reads locals instead of module globals).
+    """
+    # A location that *is* an alias key needs no scan: no longer key can
+    # occur inside it, so the exact entry is also the most specific one.
+    exact = PLACE_ALIASES.get(text)
+    if exact is not None:
+        return exact
+    for i, key in enumerate(_keys):
+        if key in text:
+            return _values[i]
+    return None
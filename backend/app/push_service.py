@@ -6,13 +6,25 @@ using pywebpush and stored VAPID keys.
 """
 
 import datetime as dt
-import json
 import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache, partial
 from pathlib import Path
-from urllib.parse import urlparse
 
+try:  # advisory cross-process locking (POSIX only)
+    import fcntl
+except ImportError:  # pragma: no cover – Windows dev boxes: thread lock only
+    fcntl = None
+
+import orjson
+import requests
+from py_vapid import Vapid
 from pywebpush import WebPushException, webpush
+from requests.adapters import HTTPAdapter
 
 
 def _determine_persist_dir() -> Path:
@@ -36,10 +48,38 @@ SUB_FILE = PERSIST_DIR / "push_service.subs.json"
 # VAPID keys should be set as environment variables in production
 VAPID_PUBLIC = os.getenv("VAPID_PUBLIC")
 VAPID_PRIVATE = os.getenv("VAPID_PRIVATE")
+VAPID_SUBJECT = "mailto:you@example.com"
+VAPID_TTL_S = 12 * 60 * 60  # JWT lifetime, as pywebpush uses
+
+# Indent the JSON written to the data volume (for reading it by hand);
+# production writes compact JSON.
+PUSH_PRETTY = os.getenv("PUSH_PRETTY", "").lower() in ("1", "true", "yes")
 
 # Security limits
 MAX_SUBSCRIPTIONS = 50000  # Cap to prevent storage abuse (~25MB at this size)
 MAX_PAYLOAD_SIZE = 2048  # 2KB max payload size for subscription
+MAX_ENDPOINT_LEN = 1024  # Real push endpoints are a few hundred chars
+MAX_KEY_LEN = 256  # p256dh is 87 chars base64url, auth 22
+
+# Fields of a browser PushSubscription.toJSON(); a subscription carrying
+# anything else (e.g. preferences) or a non-null expirationTime gets the
+# full serialized-size check.
+_SUBSCRIPTION_FIELDS = frozenset({"endpoint", "expirationTime", "keys"})
+
+# Concurrent webpush sends per broadcast (each one is a blocking HTTPS call)
+PUSH_WORKERS = int(os.getenv("PUSH_WORKERS", "16"))
+PUSH_TIMEOUT_S = 10
+
+
+def _make_session() -> requests.Session:
+    """Pooled session so sends to the same push host reuse TLS connections."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=PUSH_WORKERS, max_retries=0)
+    session.mount("https://", adapter)
+    return session
+
+
+_SESSION = _make_session()
 
 # Default notification preferences (all ON)
 DEFAULT_PREFERENCES: dict[str, bool] = {
@@ -51,24 +91,177 @@ DEFAULT_PREFERENCES: dict[str, bool] = {
 # Configure logging
 logger = logging.getLogger("push")
 
+# Guards load → mutate → save sequences against concurrent worker threads
+_LOCK = threading.RLock()
+_flock_depth = 0  # nesting of _locked(); only the outermost takes the flock
+
+
+@contextmanager
+def _locked():
+    """
+    Hold the module lock plus an advisory ``flock`` on SUB_FILE's lock file.
+
+    Re-entrant within a thread. The flock also serialises load → mutate →
+    save sequences across processes sharing the data volume.
+    """
+    global _flock_depth
+    with _LOCK:
+        lock_fh = None
+        if _flock_depth == 0 and fcntl is not None:
+            lock_fh = open(SUB_FILE.with_name(SUB_FILE.name + ".lock"), "a")
+            fcntl.flock(lock_fh, fcntl.LOCK_EX)
+        _flock_depth += 1
+        try:
+            yield
+        finally:
+            _flock_depth -= 1
+            if lock_fh is not None:
+                lock_fh.close()  # releases the flock
+
+
+def _file_key() -> tuple[Path, int, int] | None:
+    """Identity of SUB_FILE's current contents: (path, mtime_ns, size)."""
+    try:
+        st = SUB_FILE.stat()
+    except FileNotFoundError:
+        return None
+    return (SUB_FILE, st.st_mtime_ns, st.st_size)
+
+
+# Parsed endpoint index, valid while SUB_FILE's _file_key() is unchanged
+_cache: tuple[tuple[Path, int, int], dict[str, dict]] | None = None
+
+
+def _load_index() -> dict[str, dict]:
+    """
+    Stored subscriptions keyed by endpoint, in file order.
+
+    The parsed index is kept in memory and only re-read when SUB_FILE's
+    mtime or size changes, so lookups by endpoint are a dict access rather
+    than a full JSON parse and list scan.  Callers that mutate the index
+    must persist it with :func:`_save_index`.
+    """
+    global _cache
+    with _LOCK:
+        key = _file_key()
+        if key is None:
+            return {}
+        if _cache is not None and _cache[0] == key:
+            return _cache[1]
+        index = {sub["endpoint"]: sub for sub in orjson.loads(SUB_FILE.read_bytes())}
+        _cache = (key, index)
+        return index
+
+
+def has_subscriptions() -> bool:
+    """Whether at least one subscription is stored."""
+    return bool(_load_index())
+
 
 def _load_subscriptions() -> list[dict]:
     """
-    Read the JSON file of stored subscriptions.
+    Read the stored subscriptions.
 
     Returns:
         A list of subscription dicts.
     """
-    if not SUB_FILE.exists():
-        return []
-    return json.loads(SUB_FILE.read_text())
+    return list(_load_index().values())
 
 
 def _save_subscriptions(subs: list[dict]) -> None:
     """
     Overwrite SUB_FILE with the given list of subscriptions.
+
+    Written to a temp file and renamed over SUB_FILE, so readers (and a
+    crash mid-write) only ever see the old or the new contents.
+    """
+    global _cache
+    with _LOCK:
+        tmp = SUB_FILE.with_name(SUB_FILE.name + ".tmp")
+        try:
+            tmp.write_bytes(
+                orjson.dumps(subs, option=orjson.OPT_INDENT_2 if PUSH_PRETTY else 0)
+            )
+            os.replace(tmp, SUB_FILE)
+        except BaseException:
+            _cache = None
+            raise
+        _cache = (_file_key(), {sub["endpoint"]: sub for sub in subs})
+
+
+def _save_index(index: dict[str, dict]) -> None:
+    """Persist an endpoint index returned by :func:`_load_index`."""
+    _save_subscriptions(list(index.values()))
+
+
+def _epoch(value: object) -> float | None:
+    """
+    Seconds since the epoch for an ISO-8601 timestamp field.
+
+    ``None`` when the field is absent (or empty); ``nan`` when it cannot be
+    parsed or carries no UTC offset, so every comparison against it is
+    False, just as the aware/naive comparison used to raise and be skipped.
+    """
+    if not value:
+        return None
+    try:
+        parsed = dt.datetime.fromisoformat(value)  # type: ignore[arg-type]
+    except (ValueError, TypeError):
+        return _NAN
+    if parsed.tzinfo is None:
+        return _NAN
+    return parsed.timestamp()
+
+
+_NAN = float("nan")
+
+
+def _stamp(sub: dict, field: str, when: dt.datetime | None = None) -> None:
     """
-    SUB_FILE.write_text(json.dumps(subs, indent=2))
+    Set *field* to an ISO-8601 UTC timestamp plus ``<field>_ts`` in epoch seconds.
+
+    The ISO string stays the readable/API form; the integer lets scans
+    compare numbers instead of re-parsing the string.
+    """
+    when = when or dt.datetime.now(dt.timezone.utc)
+    sub[field] = when.isoformat()
+    sub[f"{field}_ts"] = int(when.timestamp())
+
+
+def _field_epoch(sub: dict, field: str) -> float | None:
+    """Epoch seconds for *field*, from ``<field>_ts`` when stored, else parsed."""
+    if not sub.get(field):
+        return None
+    ts = sub.get(f"{field}_ts")
+    if isinstance(ts, int):
+        return float(ts)
+    return _epoch(sub[field])  # entries written before the _ts fields
+
+
+# Timestamp columns parallel to the cached index: (index, sub_date, last_delivery)
+_Columns = tuple[dict[str, dict], list[float | None], list[float | None]]
+_columns: _Columns | None = None
+
+
+def _timestamp_columns() -> _Columns:
+    """
+    The endpoint index plus its ``subscription_date``/``last_delivery`` epochs.
+
+    The two lists line up with ``index.values()`` and are parsed once per
+    version of the index, so stats and cleanup compare floats instead of
+    calling ``fromisoformat`` on every subscription each time.
+    """
+    global _columns
+    with _LOCK:
+        index = _load_index()
+        if _columns is None or _columns[0] is not index:
+            subs = index.values()
+            _columns = (
+                index,
+                [_field_epoch(sub, "subscription_date") for sub in subs],
+                [_field_epoch(sub, "last_delivery") for sub in subs],
+            )
+        return _columns
 
 
 def validate_subscription(sub: dict) -> bool:
@@ -81,15 +274,6 @@ def validate_subscription(sub: dict) -> bool:
     Returns:
         True if valid, False otherwise.
     """
-    # Check payload size (rough estimate)
-    try:
-        if len(json.dumps(sub)) > MAX_PAYLOAD_SIZE:
-            logger.warning("[validation] Subscription payload too large")
-            return False
-    except (TypeError, ValueError):
-        logger.warning("[validation] Subscription not JSON-serializable")
-        return False
-
     # Must have endpoint
     endpoint = sub.get("endpoint")
     if not isinstance(endpoint, str) or not endpoint.startswith("https://"):
@@ -110,6 +294,28 @@ def validate_subscription(sub: dict) -> bool:
         logger.warning("[validation] Missing or invalid auth key")
         return False
 
+    # Size caps: a standard subscription is bounded by its field lengths, so
+    # only one carrying extra fields needs to be serialized to measure it.
+    if (
+        len(endpoint) > MAX_ENDPOINT_LEN
+        or len(keys["p256dh"]) > MAX_KEY_LEN
+        or len(keys["auth"]) > MAX_KEY_LEN
+    ):
+        logger.warning("[validation] Subscription payload too large")
+        return False
+    if (
+        len(keys) != 2
+        or not _SUBSCRIPTION_FIELDS.issuperset(sub)
+        or sub.get("expirationTime") is not None
+    ):
+        try:
+            if len(orjson.dumps(sub)) > MAX_PAYLOAD_SIZE:
+                logger.warning("[validation] Subscription payload too large")
+                return False
+        except (TypeError, ValueError):
+            logger.warning("[validation] Subscription not JSON-serializable")
+            return False
+
     return True
 
 
@@ -133,34 +339,35 @@ def add_subscription(sub: dict) -> dict:
     if not validate_subscription(sub):
         return {"ok": False, "error": "Invalid subscription"}
 
-    subs = _load_subscriptions()
+    with _locked():
+        index = _load_index()
 
-    # Check for existing subscription with same endpoint (refresh is always allowed)
-    for existing in subs:
-        if existing["endpoint"] == sub["endpoint"]:
+        # Existing subscription with same endpoint (refresh is always allowed)
+        existing = index.get(sub["endpoint"])
+        if existing is not None:
             # Update timestamp - user is still interested
-            existing["subscription_date"] = dt.datetime.now(dt.timezone.utc).isoformat()
+            _stamp(existing, "subscription_date")
             # Preserve existing preferences on refresh (don't overwrite)
-            prefs = existing.get("preferences", DEFAULT_PREFERENCES.copy())
-            _save_subscriptions(subs)
+            prefs = dict(existing.get("preferences", DEFAULT_PREFERENCES))
+            _save_index(index)
             logger.info("[subscriber refreshed] %s", sub["endpoint"])
             return {"ok": True, "preferences": prefs}
 
-    # Check subscription cap for new subscriptions
-    if len(subs) >= MAX_SUBSCRIPTIONS:
-        logger.warning(
-            "[subscription cap] Rejected new subscription, at limit (%d)",
-            MAX_SUBSCRIPTIONS,
-        )
-        return {"ok": False, "error": "Subscription limit reached"}
+        # Check subscription cap for new subscriptions
+        if len(index) >= MAX_SUBSCRIPTIONS:
+            logger.warning(
+                "[subscription cap] Rejected new subscription, at limit (%d)",
+                MAX_SUBSCRIPTIONS,
+            )
+            return {"ok": False, "error": "Subscription limit reached"}
 
-    # New subscription - use provided preferences or defaults
-    sub["subscription_date"] = dt.datetime.now(dt.timezone.utc).isoformat()
-    sub["preferences"] = sub.get("preferences", DEFAULT_PREFERENCES.copy())
-    subs.append(sub)
-    _save_subscriptions(subs)
+        # New subscription - use provided preferences or defaults
+        _stamp(sub, "subscription_date")
+        sub["preferences"] = sub.get("preferences", DEFAULT_PREFERENCES.copy())
+        index[sub["endpoint"]] = sub
+        _save_index(index)
     logger.info("[subscriber added] %s", sub["endpoint"])
-    return {"ok": True, "preferences": sub["preferences"]}
+    return {"ok": True, "preferences": dict(sub["preferences"])}
 
 
 def get_preferences(endpoint: str) -> dict | None:
@@ -174,11 +381,11 @@ def get_preferences(endpoint: str) -> dict | None:
         Preferences dict, or None if endpoint not found.
         Legacy subscriptions (no preferences) return DEFAULT_PREFERENCES.
     """
-    subs = _load_subscriptions()
-    for sub in subs:
-        if sub["endpoint"] == endpoint:
-            return sub.get("preferences", DEFAULT_PREFERENCES.copy())
-    return None
+    sub = _load_index().get(endpoint)
+    if sub is None:
+        return None
+    # A copy: the stored dict belongs to the cached index
+    return dict(sub.get("preferences", DEFAULT_PREFERENCES))
 
 
 def update_preferences(endpoint: str, preferences: dict) -> dict | None:
@@ -192,18 +399,19 @@ def update_preferences(endpoint: str, preferences: dict) -> dict | None:
     Returns:
         Updated preferences dict, or None if endpoint not found.
     """
-    subs = _load_subscriptions()
-    for sub in subs:
-        if sub["endpoint"] == endpoint:
-            # Get existing preferences (or defaults for legacy subs)
-            current = sub.get("preferences", DEFAULT_PREFERENCES.copy())
-            # Merge updates
-            current.update(preferences)
-            sub["preferences"] = current
-            _save_subscriptions(subs)
-            logger.info("[preferences updated] %s", endpoint)
-            return current
-    return None
+    with _locked():
+        index = _load_index()
+        sub = index.get(endpoint)
+        if sub is None:
+            return None
+        # Get existing preferences (or defaults for legacy subs)
+        current = sub.get("preferences", DEFAULT_PREFERENCES.copy())
+        # Merge updates
+        current.update(preferences)
+        sub["preferences"] = current
+        _save_index(index)
+    logger.info("[preferences updated] %s", endpoint)
+    return dict(current)
 
 
 def remove_subscription(endpoint: str) -> bool:
@@ -216,15 +424,13 @@ def remove_subscription(endpoint: str) -> bool:
     Returns:
         True if removed, False if not found.
     """
-    subs = _load_subscriptions()
-    original_len = len(subs)
-    subs = [s for s in subs if s["endpoint"] != endpoint]
-
-    if len(subs) < original_len:
-        _save_subscriptions(subs)
-        logger.info("[subscriber removed] %s", endpoint)
-        return True
-    return False
+    with _locked():
+        index = _load_index()
+        if index.pop(endpoint, None) is None:
+            return False
+        _save_index(index)
+    logger.info("[subscriber removed] %s", endpoint)
+    return True
 
 
 def _audience(endpoint: str) -> str:
@@ -237,7 +443,14 @@ def _audience(endpoint: str) -> str:
     Returns:
         A string suitable for the `aud` claim.
     """
-    host = urlparse(endpoint).netloc
+    # Endpoints are validated as https://host/..., so the host is the third
+    # "/"-separated field; no need for urlparse on every subscriber.
+    return _audience_for_host(endpoint.split("/", 3)[2])
+
+
+@lru_cache(maxsize=256)
+def _audience_for_host(host: str) -> str:
+    """``aud`` claim for a push-service host (a handful of distinct values)."""
     if host.endswith("push.apple.com"):
         # Apple's APNS web-push gateway
         return f"https://{host.split(':')[0]}"
@@ -248,6 +461,39 @@ def _audience(endpoint: str) -> str:
     return f"https://{host.split(':')[0]}"
 
 
+# Preference bits; a subscriber's mask has a bit set for each pref that is ON
+_PREF_BITS: dict[str, int] = {"rain_start": 1, "rain_stop": 2, "thunderstorm": 4}
+
+# Notification type → bits a subscriber must have ALL of to receive it
+_REQUIRED_PREFS: dict[str, int] = {
+    "rain_start": 1,
+    "rain_stop": 2,
+    "thunderstorm_start": 1 | 4,
+    "thunderstorm_end": 2 | 4,
+}
+
+
+def _pref_mask(sub: dict) -> int:
+    """Bitmask of a subscription's preferences (missing ones default to ON)."""
+    prefs = sub.get("preferences", DEFAULT_PREFERENCES)
+    return sum(bit for name, bit in _PREF_BITS.items() if prefs.get(name, True))
+
+
+def _required_mask(notification_type: str | None) -> int:
+    """Preference bits needed for *notification_type* (0 = everyone)."""
+    # No type filter = send to everyone (manual broadcast)
+    if notification_type is None:
+        return 0
+    required = _REQUIRED_PREFS.get(notification_type)
+    if required is None:
+        # Unknown type - default to sending
+        logger.warning(
+            "[_should_notify] Unknown notification type: %s", notification_type
+        )
+        return 0
+    return required
+
+
 def _should_notify(sub: dict, notification_type: str | None) -> bool:
     """
     Determine if a subscription should receive this notification type.
@@ -266,28 +512,92 @@ def _should_notify(sub: dict, notification_type: str | None) -> bool:
         - 'thunderstorm_end': Requires rain_stop AND thunderstorm = True
         - None: Send to all (manual broadcast)
     """
-    # No type filter = send to everyone (manual broadcast)
-    if notification_type is None:
-        return True
+    required = _required_mask(notification_type)
+    return _pref_mask(sub) & required == required
 
-    # Get preferences (default to all ON for legacy subscriptions)
-    prefs = sub.get("preferences", DEFAULT_PREFERENCES)
 
-    # Simple types: just check the matching preference
-    if notification_type == "rain_start":
-        return prefs.get("rain_start", True)
-    if notification_type == "rain_stop":
-        return prefs.get("rain_stop", True)
+# Subscribers grouped by preference mask, for the cached index: (index, buckets)
+_buckets: tuple[dict[str, dict], dict[int, list[dict]]] | None = None
 
-    # Thunderstorm types: require BOTH the base pref AND thunderstorm pref
-    if notification_type == "thunderstorm_start":
-        return prefs.get("rain_start", True) and prefs.get("thunderstorm", True)
-    if notification_type == "thunderstorm_end":
-        return prefs.get("rain_stop", True) and prefs.get("thunderstorm", True)
 
-    # Unknown type - default to sending
-    logger.warning("[_should_notify] Unknown notification type: %s", notification_type)
-    return True
+def _pref_buckets() -> dict[int, list[dict]]:
+    """
+    Stored subscriptions grouped by :func:`_pref_mask`.
+
+    With three preferences there are at most eight groups, so broadcast()
+    picks whole groups by mask instead of checking every subscriber.
+    Rebuilt once per version of the index.
+    """
+    global _buckets
+    with _LOCK:
+        index = _load_index()
+        if _buckets is None or _buckets[0] is not index:
+            groups: dict[int, list[dict]] = {}
+            for sub in index.values():
+                groups.setdefault(_pref_mask(sub), []).append(sub)
+            _buckets = (index, groups)
+        return _buckets[1]
+
+
+def _vapid_headers(audiences: set[str]) -> dict[str, dict[str, str]]:
+    """
+    Sign one VAPID JWT per audience; only the ``aud`` claim differs.
+
+    Returns an empty dict if VAPID_PRIVATE cannot be loaded here, in which
+    case webpush() signs each send itself (and reports the key error).
+    """
+    try:
+        vapid = Vapid.from_string(private_key=VAPID_PRIVATE)
+    except Exception as exc:
+        logger.warning("[push] VAPID key not loadable, signing per send: %s", exc)
+        return {}
+    exp = int(time.time()) + VAPID_TTL_S
+    return {
+        aud: vapid.sign({"sub": VAPID_SUBJECT, "aud": aud, "exp": exp})
+        for aud in audiences
+    }
+
+
+def _send_one(
+    sub: dict, data: bytes, auth: dict[str, dict[str, str]]
+) -> tuple[str, dt.datetime | None, bool]:
+    """
+    Push *data* to one subscription.
+
+    *auth* maps audience → pre-signed VAPID headers (see _vapid_headers).
+
+    Returns:
+        ``(endpoint, delivery time, dead)``: the time is ``None`` unless the
+        push went through; *dead* is True when the push service rejected the
+        subscription.  Network errors (timeouts, resets) are transient and
+        leave the subscription untouched.
+    """
+    aud = _audience(sub["endpoint"])
+    headers = auth.get(aud)
+    if headers is not None:
+        signing = {"headers": headers}
+    else:
+        signing = {
+            "vapid_private_key": VAPID_PRIVATE,
+            "vapid_claims": {"sub": VAPID_SUBJECT, "aud": aud},
+        }
+    try:
+        webpush(
+            subscription_info=sub,
+            data=data,
+            timeout=PUSH_TIMEOUT_S,
+            requests_session=_SESSION,
+            **signing,
+        )
+    except WebPushException as exc:
+        logger.warning("[push] drop dead sub: %s", exc)
+        return sub["endpoint"], None, True
+    except requests.RequestException as exc:
+        logger.warning("[push] transient failure for %s: %s", sub["endpoint"], exc)
+        return sub["endpoint"], None, False
+    logger.info("[push ✅] %s", sub["endpoint"])
+    # Last successful delivery time (keeps subscription alive)
+    return sub["endpoint"], dt.datetime.now(dt.timezone.utc), False
 
 
 def broadcast(title: str, body: str, notification_type: str | None = None) -> int:
@@ -309,38 +619,49 @@ def broadcast(title: str, body: str, notification_type: str | None = None) -> in
     if not VAPID_PRIVATE or not VAPID_PUBLIC:
         raise WebPushException("Missing VAPID keys")
 
-    subs = _load_subscriptions()
-    alive = []
-    sent_count = 0
-
-    for sub in subs:
-        # Check if subscriber wants this notification type
-        if not _should_notify(sub, notification_type):
-            alive.append(sub)  # Keep sub but don't send
-            continue
-
-        try:
-            aud = _audience(sub["endpoint"])
-            vapid_claims = {
-                "sub": "mailto:you@example.com",
-                "aud": aud,
-            }
-            webpush(
-                subscription_info=sub,
-                data=json.dumps({"title": title, "body": body}),
-                vapid_private_key=VAPID_PRIVATE,
-                vapid_claims=vapid_claims,
-            )
-            # Update last successful delivery timestamp (keeps subscription alive)
-            sub["last_delivery"] = dt.datetime.now(dt.timezone.utc).isoformat()
-            alive.append(sub)
-            sent_count += 1
-            logger.info("[push ✅] %s", sub["endpoint"])
-        except WebPushException as exc:
-            logger.warning("[push] drop dead sub: %s", exc)
-
-    _save_subscriptions(alive)
-    return sent_count
+    required = _required_mask(notification_type)
+    targets = [
+        sub
+        for mask, subs in _pref_buckets().items()
+        if mask & required == required
+        for sub in subs
+    ]
+    auth = (
+        _vapid_headers({_audience(sub["endpoint"]) for sub in targets})
+        if targets
+        else {}
+    )
+    send = partial(
+        _send_one, data=orjson.dumps({"title": title, "body": body}), auth=auth
+    )
+    if len(targets) > 1:
+        with ThreadPoolExecutor(max_workers=min(PUSH_WORKERS, len(targets))) as pool:
+            results = list(pool.map(send, targets))
+    else:
+        results = list(map(send, targets))
+
+    # endpoint → delivery timestamp, and endpoints the push service rejected;
+    # merged into a fresh load afterwards so subscribe/unsubscribe calls made
+    # while the sends were in progress are not overwritten.
+    delivered: dict[str, dt.datetime] = {}
+    dead: set[str] = set()
+    for endpoint, ts, is_dead in results:
+        if is_dead:
+            dead.add(endpoint)
+        elif ts is not None:
+            delivered[endpoint] = ts
+
+    if delivered or dead:
+        with _locked():
+            index = _load_index()
+            for endpoint, ts in delivered.items():
+                sub = index.get(endpoint)
+                if sub is not None:
+                    _stamp(sub, "last_delivery", ts)
+            for endpoint in dead:
+                index.pop(endpoint, None)
+            _save_index(index)
+    return len(delivered)
 
 
 def cleanup_old_subscriptions(max_days: int = 365) -> int:
@@ -356,50 +677,42 @@ def cleanup_old_subscriptions(max_days: int = 365) -> int:
     Returns:
         Number of subscriptions removed.
     """
-    subs = _load_subscriptions()
-    now = dt.datetime.now(dt.timezone.utc)
-    cutoff = now - dt.timedelta(days=max_days)
-
-    kept = []
-    removed_count = 0
-
-    for sub in subs:
-        # If we've ever delivered successfully, NEVER remove by time
-        # Dead subscriptions will be caught by broadcast() on next attempt
-        if sub.get("last_delivery"):
-            kept.append(sub)
-            continue
-
-        # Only apply time-based cleanup to never-delivered subscriptions
-        timestamp_str = sub.get("subscription_date")
-
-        # Keep subscriptions without any timestamps (backward compatibility)
-        if not timestamp_str:
-            kept.append(sub)
-            continue
-
-        try:
-            sub_date = dt.datetime.fromisoformat(timestamp_str)
-            if sub_date >= cutoff:
+    with _locked():
+        index, sub_dates, last_deliveries = _timestamp_columns()
+        now = time.time()
+        cutoff = now - max_days * 86400
+
+        kept = []
+        removed_count = 0
+
+        rows = zip(index.values(), sub_dates, last_deliveries)
+        for sub, sub_date, last_delivery in rows:
+            # If we've ever delivered successfully, NEVER remove by time
+            # Dead subscriptions will be caught by broadcast() on next attempt.
+            # Subscriptions without any timestamp are kept for backward
+            # compatibility; only never-delivered ones are aged out.
+            if last_delivery is not None or sub_date is None:
+                kept.append(sub)
+            elif sub_date != sub_date:  # nan: unparsable timestamp
+                logger.warning(
+                    "[cleanup] Invalid timestamp for %s: %r",
+                    sub["endpoint"],
+                    sub.get("subscription_date"),
+                )
+                kept.append(sub)
+            elif sub_date >= cutoff:
                 kept.append(sub)
             else:
                 removed_count += 1
                 logger.info(
                     "[cleanup] Removed never-delivered subscription: %s (age: %d days)",
                     sub["endpoint"],
-                    (now - sub_date).days,
+                    (now - sub_date) // 86400,
                 )
-        except (ValueError, TypeError) as e:
-            # Keep subscriptions with invalid timestamps
-            logger.warning(
-                "[cleanup] Invalid timestamp for %s: %s",
-                sub["endpoint"],
-                e,
-            )
-            kept.append(sub)
 
-    _save_subscriptions(kept)
-    return removed_count
+        if removed_count:
+            _save_subscriptions(kept)
+        return removed_count
 
 
 def get_subscription_stats() -> dict:
@@ -415,48 +728,23 @@ def get_subscription_stats() -> dict:
         - stale_never_delivered: Never delivered AND >365 days old (cleanup candidates)
         - recently_active: Number with last_delivery in last 7 days
     """
-    subs = _load_subscriptions()
-    now = dt.datetime.now(dt.timezone.utc)
-    cutoff_365 = now - dt.timedelta(days=365)
-    cutoff_7 = now - dt.timedelta(days=7)
-
-    stats = {
-        "total": len(subs),
-        "with_timestamp": 0,
-        "without_timestamp": 0,
-        "never_delivered": 0,
-        "stale_never_delivered": 0,
-        "recently_active": 0,
+    _, sub_dates, last_deliveries = _timestamp_columns()
+    now = time.time()
+    cutoff_365 = now - 365 * 86400
+    cutoff_7 = now - 7 * 86400
+
+    never_delivered = [sd for sd, ld in zip(sub_dates, last_deliveries) if ld is None]
+    without_timestamp = never_delivered.count(None)
+
+    return {
+        "total": len(sub_dates),
+        "with_timestamp": len(sub_dates) - without_timestamp,
+        "without_timestamp": without_timestamp,
+        "never_delivered": len(never_delivered) - without_timestamp,
+        "stale_never_delivered": sum(
+            1 for sd in never_delivered if sd is not None and sd < cutoff_365
+        ),
+        "recently_active": sum(
+            1 for ld in last_deliveries if ld is not None and ld >= cutoff_7
+        ),
     }
-
-    for sub in subs:
-        has_subscription_date = "subscription_date" in sub
-        has_last_delivery = "last_delivery" in sub
-
-        if not has_subscription_date and not has_last_delivery:
-            stats["without_timestamp"] += 1
-            continue
-
-        stats["with_timestamp"] += 1
-
-        # Track never-delivered subscriptions
-        if not has_last_delivery:
-            stats["never_delivered"] += 1
-            # Check if stale (cleanup candidate)
-            try:
-                sub_date = dt.datetime.fromisoformat(sub["subscription_date"])
-                if sub_date < cutoff_365:
-                    stats["stale_never_delivered"] += 1
-            except (ValueError, TypeError):
-                pass
-
-        # Track recently active (based on last_delivery)
-        if has_last_delivery:
-            try:
-                last_delivery = dt.datetime.fromisoformat(sub["last_delivery"])
-                if last_delivery >= cutoff_7:
-                    stats["recently_active"] += 1
-            except (ValueError, TypeError):
-                pass
-
-    return stats
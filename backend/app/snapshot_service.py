@@ -3,25 +3,29 @@
 Rolling debug snapshot manager for production observability.
 
 Periodically captures the full debug state (location + weather) and stores
-it in a JSON file with automatic rotation. Keeps the last N hours of snapshots.
+it in a JSON Lines file (one snapshot per line, oldest first) with automatic
+rotation. Keeps the last N hours of snapshots.
 
 Configuration:
     SNAPSHOT_MAX_AGE_H: Maximum age of snapshots to keep (default: 168 = 7 days)
 
 Storage:
-    - Production: /data/debug_history.json (Fly.io volume)
-    - Development: local_data/debug_history.json
+    - Production: /data/debug_history.jsonl (Fly.io volume)
+    - Development: local_data/debug_history.jsonl
 """
 
 from __future__ import annotations
 
+import bisect
 import datetime as dt
-import json
 import logging
 import os
+import time
 from pathlib import Path
 from typing import Any, Final
 
+import orjson
+
 UTC: Final = dt.timezone.utc
 LOG = logging.getLogger("snapshot_service")
 
@@ -43,52 +47,103 @@ def _determine_dir() -> Path:
 
 
 DIR = _determine_dir()
-FILE = DIR / "debug_history.json"
+FILE = DIR / "debug_history.jsonl"
+_LEGACY_FILE = DIR / "debug_history.json"  # single JSON document, pre-JSONL
+
+# Bytes read per step when tailing FILE for the newest snapshots
+_TAIL_BLOCK = 64 * 1024
 
 
 # ── Snapshot Storage ──────────────────────────────────────────────────────
+# Store version, bumped on every write; with FILE it keys the stats cache.
+_seq = 0
+_stats_cache: tuple[tuple[int, Path], dict[str, Any], dt.datetime | None] | None = None
 
 
-def _load_snapshots() -> list[dict[str, Any]]:
-    """Load existing snapshots from disk."""
-    if not FILE.exists():
-        return []
+def _encode(snap: dict[str, Any]) -> bytes:
+    """One JSON Lines record (orjson never emits a raw newline)."""
+    return orjson.dumps(snap, default=str, option=orjson.OPT_NON_STR_KEYS) + b"\n"
 
+
+def _parse_lines(lines: list[bytes]) -> list[dict[str, Any]]:
+    """Decode JSON Lines records, skipping blank and malformed lines."""
+    snapshots = []
+    bad = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            snapshots.append(orjson.loads(line))
+        except orjson.JSONDecodeError:
+            bad += 1
+    if bad:
+        LOG.warning("[snapshot] Skipped %d malformed history line(s)", bad)
+    return snapshots
+
+
+def _load_snapshots() -> list[dict[str, Any]]:
+    """Load existing snapshots from disk, oldest first."""
     try:
-        data = json.loads(FILE.read_text())
-        return data.get("snapshots", [])
+        return _parse_lines(FILE.read_bytes().splitlines())
+    except FileNotFoundError:
+        return []
     except Exception as exc:
         LOG.warning("[snapshot] Failed to load history: %s", exc)
         return []
 
 
+def _tail_snapshots(n: int) -> list[dict[str, Any]]:
+    """The newest *n* snapshots, oldest first, read backwards from EOF."""
+    try:
+        with FILE.open("rb") as fh:
+            pos = fh.seek(0, os.SEEK_END)
+            buf = b""
+            # n + 1 newlines guarantee n whole lines after a partial first one
+            while pos > 0 and buf.count(b"\n") <= n:
+                step = min(_TAIL_BLOCK, pos)
+                pos -= step
+                fh.seek(pos)
+                buf = fh.read(step) + buf
+    except FileNotFoundError:
+        return []
+    lines = buf.splitlines()
+    if pos > 0:
+        lines = lines[1:]
+    return _parse_lines(lines[-n:])
+
+
 def _save_snapshots(snapshots: list[dict[str, Any]]) -> None:
-    """Save snapshots to disk."""
+    """Rewrite the history file with *snapshots* (stored oldest first)."""
+    global _seq
+    _seq += 1
     try:
-        data = {
-            "snapshots": snapshots,
-            "max_age_hours": SNAPSHOT_MAX_AGE_H,
-            "updated_at": dt.datetime.now(UTC).isoformat(),
-        }
-        FILE.write_text(json.dumps(data, indent=2, default=str))
+        ordered = sorted(snapshots, key=_snapshot_epoch)
+        tmp = FILE.with_name(FILE.name + ".tmp")
+        tmp.write_bytes(b"".join(map(_encode, ordered)))
+        os.replace(tmp, FILE)
     except Exception as exc:
         LOG.error("[snapshot] Failed to save history: %s", exc)
 
 
+def _migrate_legacy() -> None:
+    """Convert a pre-JSONL ``debug_history.json`` into FILE once."""
+    if FILE.exists() or not _LEGACY_FILE.exists():
+        return
+    try:
+        data = orjson.loads(_LEGACY_FILE.read_bytes())
+        _save_snapshots(data.get("snapshots", []))
+        _LEGACY_FILE.unlink()
+        LOG.info("[snapshot] Migrated %s to JSON Lines", _LEGACY_FILE.name)
+    except Exception as exc:
+        LOG.warning("[snapshot] Could not migrate legacy history: %s", exc)
+
+
 def _prune_old(snapshots: list[dict[str, Any]]) -> list[dict[str, Any]]:
     """Remove snapshots older than SNAPSHOT_MAX_AGE_H."""
-    cutoff = dt.datetime.now(UTC) - dt.timedelta(hours=SNAPSHOT_MAX_AGE_H)
+    cutoff = time.time() - SNAPSHOT_MAX_AGE_H * 3600
 
-    kept = []
-    for snap in snapshots:
-        try:
-            ts_str = snap.get("ts", "")
-            ts = dt.datetime.fromisoformat(ts_str)
-            if ts >= cutoff:
-                kept.append(snap)
-        except Exception:
-            # Skip malformed entries
-            continue
+    # Malformed entries sort as -inf, so they are dropped here too
+    kept = [snap for snap in snapshots if _snapshot_epoch(snap) >= cutoff]
 
     pruned = len(snapshots) - len(kept)
     if pruned > 0:
@@ -97,25 +152,47 @@ def _prune_old(snapshots: list[dict[str, Any]]) -> list[dict[str, Any]]:
     return kept
 
 
+def _oldest_epoch() -> float | None:
+    """Timestamp on the first (oldest) line of FILE, without reading the rest."""
+    try:
+        with FILE.open("rb") as fh:
+            first = fh.readline()
+    except FileNotFoundError:
+        return None
+    try:
+        return _snapshot_epoch(orjson.loads(first))
+    except orjson.JSONDecodeError:
+        return _EPOCH_MIN
+
+
 def add_snapshot(
     coords: dict[str, Any],
     precip: dict[str, Any],
     loc_trace: list[dict[str, Any]] | None = None,
     weather_trace: list[dict[str, Any]] | None = None,
+    now: dt.datetime | None = None,
 ) -> None:
     """
     Add a new debug snapshot to the rolling history.
 
+    The snapshot is appended as one line; the file is only rewritten (to
+    drop expired entries) once the oldest line is a twenty-fourth of the
+    retention window past it, rather than on every append.
+
     Args:
         coords: Current location coordinates (from current_coords).
         precip: Current precipitation data (from get_precip).
         loc_trace: Location service trace (optional).
         weather_trace: Weather service trace (optional).
+        now: Snapshot timestamp (defaults to the current UTC time).
     """
-    now = dt.datetime.now(UTC)
+    global _seq
+    if now is None:
+        now = dt.datetime.now(UTC)
 
     snapshot = {
         "ts": now.isoformat(),
+        "epoch": int(now.timestamp()),
         "coords": coords,
         "precip": precip,
     }
@@ -125,13 +202,40 @@ def add_snapshot(
     if weather_trace:
         snapshot["weather_trace"] = weather_trace
 
-    # Load existing, add new, prune old, save
-    snapshots = _load_snapshots()
-    snapshots.append(snapshot)
-    snapshots = _prune_old(snapshots)
-    _save_snapshots(snapshots)
+    try:
+        with FILE.open("ab") as fh:
+            fh.write(_encode(snapshot))
+    except Exception as exc:
+        LOG.error("[snapshot] Failed to append snapshot: %s", exc)
+        return
+    _seq += 1
+
+    oldest = _oldest_epoch()
+    rewrite_before = now.timestamp() - SNAPSHOT_MAX_AGE_H * 3600 * 25 / 24
+    if oldest is not None and oldest < rewrite_before:
+        _save_snapshots(_prune_old(_load_snapshots()))
 
-    LOG.debug("[snapshot] Added snapshot at %s (total: %d)", now.isoformat(), len(snapshots))
+    LOG.debug("[snapshot] Added snapshot at %s", snapshot["ts"])
+
+
+_EPOCH_MIN: Final = float("-inf")
+
+
+def _snapshot_epoch(snap: dict[str, Any]) -> float:
+    """
+    Snapshot time in epoch seconds (malformed ones sort as oldest).
+
+    Uses the stored ``epoch`` when present and only parses the ISO ``ts``
+    for snapshots written before it existed.
+    """
+    epoch = snap.get("epoch")
+    if isinstance(epoch, int):
+        return epoch
+    try:
+        ts = dt.datetime.fromisoformat(snap.get("ts", ""))
+    except Exception:
+        return _EPOCH_MIN
+    return (ts if ts.tzinfo is not None else ts.replace(tzinfo=UTC)).timestamp()
 
 
 def get_snapshots(
@@ -148,33 +252,34 @@ def get_snapshots(
     Returns:
         List of snapshots, newest first.
     """
+    # The newest entries are at the end of the file, so a plain limit only
+    # needs a tail read rather than parsing the whole history.
+    if since_hours is None and limit is not None:
+        return _tail_snapshots(limit)[::-1]
+
     snapshots = _load_snapshots()
 
-    # Filter by time if requested
+    # add_snapshot appends in time order, so the stored list is normally
+    # already sorted oldest → newest; only re-sort if it was edited by hand.
+    keys = [_snapshot_epoch(snap) for snap in snapshots]
+    if any(a > b for a, b in zip(keys, keys[1:])):
+        snapshots.sort(key=_snapshot_epoch)
+
+    # Filter by time if requested: binary search for the cutoff instead of
+    # parsing every timestamp
+    start = 0
     if since_hours is not None:
-        cutoff = dt.datetime.now(UTC) - dt.timedelta(hours=since_hours)
-        filtered = []
-        for snap in snapshots:
-            try:
-                ts = dt.datetime.fromisoformat(snap.get("ts", ""))
-                if ts >= cutoff:
-                    filtered.append(snap)
-            except Exception:
-                continue
-        snapshots = filtered
-
-    # Sort newest first
-    snapshots.sort(key=lambda s: s.get("ts", ""), reverse=True)
-
-    # Apply limit
-    if limit is not None:
-        snapshots = snapshots[:limit]
+        cutoff = time.time() - since_hours * 3600
+        start = bisect.bisect_left(snapshots, cutoff, key=_snapshot_epoch)
 
-    return snapshots
+    # Apply limit, newest first
+    if limit is not None:
+        start = max(start, len(snapshots) - limit)
+    return snapshots[start:][::-1]
 
 
-def get_snapshot_stats() -> dict[str, Any]:
-    """Get statistics about stored snapshots."""
+def _compute_snapshot_stats() -> tuple[dict[str, Any], dt.datetime | None]:
+    """Scan stored snapshots; returns time-independent stats + oldest ts."""
     snapshots = _load_snapshots()
 
     if not snapshots:
@@ -183,7 +288,7 @@ def get_snapshot_stats() -> dict[str, Any]:
             "oldest": None,
             "newest": None,
             "max_age_hours": SNAPSHOT_MAX_AGE_H,
-        }
+        }, None
 
     # Get timestamps
     timestamps = []
@@ -200,7 +305,7 @@ def get_snapshot_stats() -> dict[str, Any]:
             "oldest": None,
             "newest": None,
             "max_age_hours": SNAPSHOT_MAX_AGE_H,
-        }
+        }, None
 
     oldest = min(timestamps)
     newest = max(timestamps)
@@ -209,6 +314,31 @@ def get_snapshot_stats() -> dict[str, Any]:
         "count": len(snapshots),
         "oldest": oldest.isoformat(),
         "newest": newest.isoformat(),
-        "age_hours": (dt.datetime.now(UTC) - oldest).total_seconds() / 3600,
         "max_age_hours": SNAPSHOT_MAX_AGE_H,
-    }
+    }, oldest
+
+
+def store_version() -> tuple[int, Path]:
+    """Key that changes on every save (or when FILE is repointed)."""
+    return (_seq, FILE)
+
+
+def get_snapshot_stats() -> dict[str, Any]:
+    """Get statistics about stored snapshots.
+
+    The file scan is cached until the next save; only ``age_hours`` is
+    recomputed per call.
+    """
+    global _stats_cache
+    key = (_seq, FILE)
+    if _stats_cache is None or _stats_cache[0] != key:
+        _stats_cache = (key, *_compute_snapshot_stats())
+    _, cached, oldest = _stats_cache
+
+    stats = dict(cached)
+    if oldest is not None:
+        stats["age_hours"] = (dt.datetime.now(UTC) - oldest).total_seconds() / 3600
+    return stats
+
+
+_migrate_legacy()
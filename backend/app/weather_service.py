@@ -20,42 +20,111 @@ Public helper
             "sunset": str | None,       # ISO8601 local time
         }
         or (result, trace) when *trace* list supplied.
+
+    get_precip_with_trace(lat, lon, trace=None, ts=None) -> (result, trace)
+        Uncached variant for the debug endpoints.
 """
 
 from __future__ import annotations
 
+import asyncio
 import datetime as dt
-from typing import Any
+import time
 
 import httpx
+import orjson
 
 from .constants import USER_AGENT
 
+# WMO weather code → thunderstorm state: 95 = moderate thunderstorm,
+# 96/97/99 = severe (with hail).  Every other code is "none".
+_THUNDERSTORM_STATE: dict[int, str] = {
+    95: "moderate",
+    96: "severe",
+    97: "severe",
+    99: "severe",
+}
+
+
+# ── Shared HTTP client ───────────────────────────────────────────────────
+# One pooled client so the TLS connection to Open-Meteo is reused across
+# cache misses.  Created lazily; closed from the app's lifespan shutdown.
+_HTTP_CLIENT: httpx.AsyncClient | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared ``httpx.AsyncClient``, creating it on first use."""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None or _HTTP_CLIENT.is_closed:
+        _HTTP_CLIENT = httpx.AsyncClient(
+            timeout=10,
+            headers={"User-Agent": USER_AGENT},
+            limits=httpx.Limits(max_keepalive_connections=10),
+        )
+    return _HTTP_CLIENT
+
+
+async def aclose_http_client() -> None:
+    """Close the shared HTTP client (call on application shutdown)."""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is not None:
+        await _HTTP_CLIENT.aclose()
+        _HTTP_CLIENT = None
+
+
 # ── Tiny per-argument TTL cache ──────────────────────────────────────────
-_cached: dict[str, tuple[dt.datetime, Any]] = {}
+def memo(seconds: int = 600, ndigits: int | None = None, maxsize: int = 4096):
+    """Per-argument TTL cache, bounded to *maxsize* entries.
+
+    Calls passing a debug *trace* list or ``bypass_cache=True`` neither read
+    nor write the cache, so one-off debug fetches leave shared entries alone.
 
+    With *ndigits*, float positional args are rounded before keying so
+    near-identical coordinates share one entry.
 
-def memo(seconds: int = 600):
-    """Per-argument TTL cache that ignores the debug *trace* kwarg."""
+    Concurrent misses for the same key share one in-flight call, so a burst
+    of callers in one grid cell triggers a single upstream request.
+
+    Entries are stamped with ``time.monotonic()`` and kept in write order,
+    so once the cache is full the oldest (first to expire) entry is evicted.
+
+    Error results (a dict with ``error`` set) are returned but not cached,
+    so one failed upstream call does not pin "unknown" for the whole TTL.
+    """
 
     def deco(fn):
-        cache: dict[tuple, tuple[dt.datetime, object]] = {}
+        cache: dict[tuple, tuple[float, object]] = {}
+        inflight: dict[tuple, asyncio.Future] = {}
 
         async def wrapped(*args, **kwargs):
+            if kwargs.get("trace") is not None or kwargs.get("bypass_cache"):
+                return await fn(*args, **kwargs)
             key_kwargs = tuple(
                 sorted((k, repr(v)) for k, v in kwargs.items() if k != "trace")
             )
-            key = (args, key_kwargs)
-
-            now = dt.datetime.now(dt.timezone.utc)
-            ts, val = cache.get(
-                key,
-                (dt.datetime.min.replace(tzinfo=dt.timezone.utc), None),
+            key_args = (
+                tuple(round(a, ndigits) if isinstance(a, float) else a for a in args)
+                if ndigits is not None
+                else args
             )
-            if (now - ts).total_seconds() < seconds:
+            key = (key_args, key_kwargs)
+
+            now = time.monotonic()
+            hit = cache.get(key)
+            if hit is not None and now - hit[0] < seconds:
+                return hit[1]
+            task = inflight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(fn(*args, **kwargs))
+                inflight[key] = task
+                task.add_done_callback(lambda _t: inflight.pop(key, None))
+            val = await asyncio.shield(task)
+            if isinstance(val, dict) and val.get("error"):
                 return val
-            val = await fn(*args, **kwargs)
+            cache.pop(key, None)
             cache[key] = (now, val)
+            if len(cache) > maxsize:
+                del cache[next(iter(cache))]
             return val
 
         wrapped.cache_clear = cache.clear  # type: ignore[attr-defined]
@@ -65,12 +134,16 @@ def memo(seconds: int = 600):
 
 
 # ── Public helper ───────────────────────────────────────────────────────
-@memo(300)
+# TTL matches the 5-minute poll in main.py, so the background loop keeps the
+# entry for Trump's current location warm for /is_it_raining.json.
+@memo(300, ndigits=2)
 async def get_precip(
     lat: float,
     lon: float,
     *,
     trace: list[dict] | None = None,
+    bypass_cache: bool = False,
+    ts: str | None = None,
 ) -> dict | tuple[dict, list[dict]]:
     """
     Return precipitation data including rain and snow.
@@ -78,6 +151,10 @@ async def get_precip(
     Args:
         lat, lon: Decimal degrees.
         trace:    Optional list that collects diagnostic steps.
+        bypass_cache: Fetch fresh data without touching the memo cache
+                  (implied by *trace*).
+        ts:       Timestamp for the trace steps, so a caller building a
+                  larger trace can stamp it once (default: now).
 
     Returns:
         {
@@ -89,9 +166,10 @@ async def get_precip(
         }
         •or• (result, trace) when *trace* arg supplied.
     """
-    ts = dt.datetime.now(dt.timezone.utc).isoformat()
-    trace = trace if trace is not None else []
-    trace.append(
+    if ts is None:
+        ts = dt.datetime.now(dt.timezone.utc).isoformat()
+    trace_log = trace if trace is not None else []
+    trace_log.append(
         {
             "ts": ts,
             "phase": "weather",
@@ -107,13 +185,10 @@ async def get_precip(
         "&daily=sunrise,sunset"
         "&timezone=auto"
     )
-    trace.append({"ts": ts, "phase": "weather", "step": "fetch", "url": url})
+    trace_log.append({"ts": ts, "phase": "weather", "step": "fetch", "url": url})
 
-    async with httpx.AsyncClient(
-        timeout=10, headers={"User-Agent": USER_AGENT}
-    ) as client:
-        resp = await client.get(url)
-    trace.append(
+    resp = await _get_client().get(url)
+    trace_log.append(
         {
             "ts": ts,
             "phase": "weather",
@@ -125,23 +200,27 @@ async def get_precip(
     # Check HTTP status before parsing JSON
     if resp.status_code != 200:
         try:
-            error_data = resp.json()
+            error_data = orjson.loads(resp.content)
             reason = error_data.get("reason", f"HTTP {resp.status_code} error")
         except Exception:
             reason = f"HTTP {resp.status_code} error (unable to parse response)"
 
-        trace.append({"ts": ts, "phase": "weather", "step": "error", "reason": reason})
+        trace_log.append(
+            {"ts": ts, "phase": "weather", "step": "error", "reason": reason}
+        )
         result = {"error": True, "reason": reason, "precipitating": None}
-        return (result, trace) if trace is not None else result
+        return (result, trace_log) if trace is not None else result
 
     # Parse successful response
     try:
-        data = resp.json()
+        data = orjson.loads(resp.content)
     except Exception as exc:
         reason = f"Failed to parse JSON response: {exc}"
-        trace.append({"ts": ts, "phase": "weather", "step": "error", "reason": reason})
+        trace_log.append(
+            {"ts": ts, "phase": "weather", "step": "error", "reason": reason}
+        )
         result = {"error": True, "reason": reason, "precipitating": None}
-        return (result, trace) if trace is not None else result
+        return (result, trace_log) if trace is not None else result
 
     # Get timezone offset from API response (returns local time with timezone=auto)
     utc_offset_seconds = data.get("utc_offset_seconds", 0)
@@ -165,9 +244,11 @@ async def get_precip(
         weather_code = int(weather_codes[idx])
     except (KeyError, ValueError, IndexError) as exc:
         reason = f"Malformed API response: missing or invalid data ({exc})"
-        trace.append({"ts": ts, "phase": "weather", "step": "error", "reason": reason})
+        trace_log.append(
+            {"ts": ts, "phase": "weather", "step": "error", "reason": reason}
+        )
         result = {"error": True, "reason": reason, "precipitating": None}
-        return (result, trace) if trace is not None else result
+        return (result, trace_log) if trace is not None else result
 
     # Extract sunrise/sunset from daily data (returns today's values)
     try:
@@ -178,17 +259,8 @@ async def get_precip(
         sunrise = None
         sunset = None
 
-    # Determine thunderstorm state from weather code
-    # WMO codes: 95 = moderate thunderstorm, 96/97/99 = severe (with hail)
-    if weather_code in (96, 97, 99):
-        thunderstorm_state = "severe"
-        thunderstorm = True
-    elif weather_code == 95:
-        thunderstorm_state = "moderate"
-        thunderstorm = True
-    else:
-        thunderstorm_state = "none"
-        thunderstorm = False
+    thunderstorm_state = _THUNDERSTORM_STATE.get(weather_code, "none")
+    thunderstorm = thunderstorm_state != "none"
 
     raining = rain > 0.0
     snowing = snow > 0.0
@@ -203,7 +275,7 @@ async def get_precip(
     else:
         precip_type = "none"
 
-    trace.append(
+    trace_log.append(
         {
             "ts": ts,
             "phase": "weather",
@@ -233,4 +305,13 @@ async def get_precip(
         "sunrise": sunrise,
         "sunset": sunset,
     }
-    return (result, trace) if trace is not None else result
+    return (result, trace_log) if trace is not None else result
+
+
+async def get_precip_with_trace(
+    lat: float, lon: float, trace: list[dict] | None = None, ts: str | None = None
+) -> tuple[dict, list[dict]]:
+    """Uncached ``get_precip`` that always returns ``(result, trace)``."""
+    return await get_precip(
+        lat, lon, trace=trace if trace is not None else [], bypass_cache=True, ts=ts
+    )
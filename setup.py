@@ -8,6 +8,7 @@ setup(
     packages=find_packages(where="backend"),
     install_requires=[
         "httpx>=0.23",
+        "orjson>=3.9",
         "fastapi>=0.95",
         "uvicorn>=0.22",
         "python-opensky>=1.0.1",
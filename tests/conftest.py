@@ -80,3 +80,42 @@ def isolate_arrival_cache_tmp(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -
     # ------------------------------------------------------------------ #
     if temp_cache_dir.exists():
         shutil.rmtree(temp_cache_dir)
+
+
+@pytest.fixture(autouse=True)
+def isolate_geocode_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Start every test with an empty geocode cache persisted under *tmp_path*,
+    so cached Nominatim results never leak between tests or test runs.
+    """
+    from app import location_service as ls
+
+    monkeypatch.setattr(ls, "GEOCODE_CACHE_FILE", tmp_path / "geocode_cache.json")
+    monkeypatch.setattr(ls, "_geocode_cache", {})
+    monkeypatch.setattr(ls, "_geocode_misses", {})
+    yield
+
+
+@pytest.fixture(autouse=True)
+def clear_location_memo() -> None:
+    """
+    Clear location_service's ``memo`` cache before each test, so the
+    short-lived shared ``current_coords()`` result never crosses tests.
+    """
+    from app import location_service as ls
+
+    ls._cached.clear()
+    yield
+    ls._cached.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_location_emit_key(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Reset location_service's ``_last_emit_key`` so the state-change dedupe
+    of one test never suppresses events in the next.
+    """
+    from app import location_service as ls
+
+    monkeypatch.setattr(ls, "_last_emit_key", None)
+    yield
@@ -6,6 +6,8 @@ Test precipitation state debouncing/hysteresis logic.
 
 from __future__ import annotations
 
+from collections import deque
+
 import pytest
 from app.main import should_notify_state_change
 
@@ -15,16 +17,14 @@ def test_should_notify_no_history():
     First check (no history) should NOT notify.
     Need at least 2 observations to confirm state is stable.
     """
-    history = []
+    history: deque[str] = deque(maxlen=2)
     prev_notified = None
     curr_state = "rain"
 
-    should_notify, new_history = should_notify_state_change(
-        history, prev_notified, curr_state
-    )
+    should_notify = should_notify_state_change(history, prev_notified, curr_state)
 
     assert should_notify is False
-    assert new_history == ["rain"]
+    assert list(history) == ["rain"]
 
 
 def test_should_notify_stable_new_state():
@@ -32,16 +32,14 @@ def test_should_notify_stable_new_state():
     State is stable for 2 checks AND different from last notified → notify.
     Example: none → rain → rain (should notify on second rain)
     """
-    history = ["rain"]
+    history: deque[str] = deque(["rain"], maxlen=2)
     prev_notified = "none"
     curr_state = "rain"
 
-    should_notify, new_history = should_notify_state_change(
-        history, prev_notified, curr_state
-    )
+    should_notify = should_notify_state_change(history, prev_notified, curr_state)
 
     assert should_notify is True
-    assert new_history == ["rain", "rain"]
+    assert list(history) == ["rain", "rain"]
 
 
 def test_should_not_notify_unstable_state():
@@ -49,16 +47,14 @@ def test_should_not_notify_unstable_state():
     State is flapping → do NOT notify.
     Example: rain → none → rain (unstable, don't notify)
     """
-    history = ["none"]
+    history: deque[str] = deque(["none"], maxlen=2)
     prev_notified = "rain"
     curr_state = "rain"
 
-    should_notify, new_history = should_notify_state_change(
-        history, prev_notified, curr_state
-    )
+    should_notify = should_notify_state_change(history, prev_notified, curr_state)
 
     assert should_notify is False  # Not stable yet
-    assert new_history == ["none", "rain"]
+    assert list(history) == ["none", "rain"]
 
 
 def test_should_not_notify_same_as_last_notified():
@@ -66,49 +62,43 @@ def test_should_not_notify_same_as_last_notified():
     State is stable but same as last notified → do NOT notify.
     Prevents duplicate notifications.
     """
-    history = ["rain", "rain"]
+    history: deque[str] = deque(["rain", "rain"], maxlen=2)
     prev_notified = "rain"
     curr_state = "rain"
 
-    should_notify, new_history = should_notify_state_change(
-        history, prev_notified, curr_state
-    )
+    should_notify = should_notify_state_change(history, prev_notified, curr_state)
 
     assert should_notify is False
-    assert new_history == ["rain", "rain"]
+    assert list(history) == ["rain", "rain"]
 
 
 def test_should_notify_stable_different_state():
     """
     State changed from rain → snow and is stable for 2 checks → notify.
     """
-    history = ["snow"]
+    history: deque[str] = deque(["snow"], maxlen=2)
     prev_notified = "rain"
     curr_state = "snow"
 
-    should_notify, new_history = should_notify_state_change(
-        history, prev_notified, curr_state
-    )
+    should_notify = should_notify_state_change(history, prev_notified, curr_state)
 
     assert should_notify is True
-    assert new_history == ["snow", "snow"]
+    assert list(history) == ["snow", "snow"]
 
 
 def test_history_limited_to_two():
     """
     History should be limited to last 2 states (sliding window).
     """
-    history = ["rain", "rain"]
+    history: deque[str] = deque(["rain", "rain"], maxlen=2)
     prev_notified = "rain"
     curr_state = "snow"
 
-    should_notify, new_history = should_notify_state_change(
-        history, prev_notified, curr_state
-    )
+    should_notify = should_notify_state_change(history, prev_notified, curr_state)
 
     assert should_notify is False  # Not stable yet (only 1 snow)
-    assert new_history == ["rain", "snow"]  # Oldest "rain" dropped
-    assert len(new_history) == 2
+    assert list(history) == ["rain", "snow"]  # Oldest "rain" dropped
+    assert len(history) == 2
 
 
 def test_flapping_scenario_full_cycle():
@@ -117,35 +107,35 @@ def test_flapping_scenario_full_cycle():
     Should only notify when state is stable.
     """
     prev_notified = "none"
-    history = []
+    history: deque[str] = deque(maxlen=2)
 
     # Check 1: rain (first observation, no notify)
-    should_notify, history = should_notify_state_change(history, prev_notified, "rain")
+    should_notify = should_notify_state_change(history, prev_notified, "rain")
     assert should_notify is False
-    assert history == ["rain"]
+    assert list(history) == ["rain"]
 
     # Check 2: rain (stable, notify!)
-    should_notify, history = should_notify_state_change(history, prev_notified, "rain")
+    should_notify = should_notify_state_change(history, prev_notified, "rain")
     assert should_notify is True
-    assert history == ["rain", "rain"]
+    assert list(history) == ["rain", "rain"]
     prev_notified = "rain"  # Update after notification
 
     # Check 3: none (unstable, no notify)
-    should_notify, history = should_notify_state_change(history, prev_notified, "none")
+    should_notify = should_notify_state_change(history, prev_notified, "none")
     assert should_notify is False
-    assert history == ["rain", "none"]
+    assert list(history) == ["rain", "none"]
 
     # Check 4: rain (back to rain, unstable, no notify)
-    should_notify, history = should_notify_state_change(history, prev_notified, "rain")
+    should_notify = should_notify_state_change(history, prev_notified, "rain")
     assert should_notify is False
-    assert history == ["none", "rain"]
+    assert list(history) == ["none", "rain"]
 
     # Check 5: none (flapping continues, no notify)
-    should_notify, history = should_notify_state_change(history, prev_notified, "none")
+    should_notify = should_notify_state_change(history, prev_notified, "none")
     assert should_notify is False
-    assert history == ["rain", "none"]
+    assert list(history) == ["rain", "none"]
 
     # Check 6: none (stable at none, notify!)
-    should_notify, history = should_notify_state_change(history, prev_notified, "none")
+    should_notify = should_notify_state_change(history, prev_notified, "none")
     assert should_notify is True
-    assert history == ["none", "none"]
+    assert list(history) == ["none", "none"]
@@ -17,7 +17,7 @@ from app import snapshot_service as ss
 @pytest.fixture
 def snapshot_dir(tmp_path, monkeypatch):
     """Redirect snapshot storage to temp directory."""
-    snapshot_file = tmp_path / "debug_history.json"
+    snapshot_file = tmp_path / "debug_history.jsonl"
     monkeypatch.setattr(ss, "DIR", tmp_path)
     monkeypatch.setattr(ss, "FILE", snapshot_file)
     return tmp_path
@@ -159,3 +159,34 @@ def test_debug_history_json_link_in_html(client_with_snapshots):
     resp = client_with_snapshots.get("/debug/history")
     assert resp.status_code == 200
     assert "/debug/history.json" in resp.text
+
+
+def test_debug_history_html_escapes_location(snapshot_dir):
+    """Location names from external feeds are HTML-escaped in the table."""
+    ss._save_snapshots(
+        [
+            {
+                "ts": dt.datetime.now(dt.timezone.utc).isoformat(),
+                "coords": {"name": "<script>alert(1)</script>"},
+                "precip": {"rain": 0.0, "snow": 0.0},
+            }
+        ]
+    )
+    resp = TestClient(main.app).get("/debug/history")
+    assert resp.status_code == 200
+    assert "<script>alert(1)</script>" not in resp.text
+    assert "&lt;script&gt;" in resp.text
+
+
+def test_debug_history_html_not_modified_until_next_save(client_with_snapshots):
+    """A matching If-None-Match gets 304 until a new snapshot is saved."""
+    first = client_with_snapshots.get("/debug/history")
+    etag = first.headers["etag"]
+
+    resp = client_with_snapshots.get("/debug/history", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+
+    ss._save_snapshots(ss._load_snapshots())
+    resp = client_with_snapshots.get("/debug/history", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
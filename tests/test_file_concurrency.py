@@ -98,6 +98,32 @@ class TestSubscriptionFileConcurrency:
             # after concurrent writes. Real-world usage is sequential.
             pass
 
+    def test_concurrent_add_subscription_keeps_every_subscriber(
+        self, sub_file: Path
+    ) -> None:
+        """Locked load → mutate → save: no concurrent subscribe is lost."""
+        from app.push_service import add_subscription
+
+        threads = [
+            threading.Thread(
+                target=add_subscription,
+                args=(
+                    {
+                        "endpoint": f"https://push.example.com/{i}",
+                        "keys": {"p256dh": "key", "auth": "auth"},
+                    },
+                ),
+            )
+            for i in range(10)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(json.loads(sub_file.read_text())) == 10
+        assert not sub_file.with_name(sub_file.name + ".tmp").exists()
+
     def test_concurrent_read_during_write_no_crash(
         self, sub_file: Path
     ) -> None:
@@ -431,3 +431,136 @@ class TestEmitLowImportanceGeocode:
             assert "Coordinates" in field_names
             assert "Resolved To" in field_names
             assert "Action" in field_names
+
+
+class TestGeocodeCache:
+    """Tests for the persistent geocode result cache."""
+
+    @pytest.fixture
+    def mock_geocode(self):
+        """Mock the rate-limited geocoder."""
+        with patch("app.location_service._geocode_raw") as mock:
+            yield mock
+
+    @pytest.fixture(autouse=True)
+    def quiet_side_effects(self):
+        """Mock the geocode log and Discord alerts."""
+        with (
+            patch("app.location_service.add_geocode_entry"),
+            patch("app.location_service.emit_geocode_failure"),
+            patch("app.location_service.emit_low_importance_geocode"),
+        ):
+            yield
+
+    def test_hit_skips_nominatim_and_persists(self, mock_geocode):
+        """A repeated query is served from the cache and written to disk."""
+        from app import location_service as ls
+
+        mock_result = MagicMock()
+        mock_result.latitude = 26.6771
+        mock_result.longitude = -80.0370
+        mock_result.address = "Mar-a-Lago, Palm Beach, FL"
+        mock_result.raw = {"address": {"state": "Florida"}, "importance": 0.6}
+        mock_geocode.return_value = mock_result
+
+        ls._smart_geocode("Mar-a-Lago")
+        cached = ls._smart_geocode("  MAR-A-LAGO ")
+
+        assert mock_geocode.call_count == 1
+        assert cached.latitude == 26.6771
+        assert cached.raw["importance"] == 0.6
+        saved = json.loads(ls.GEOCODE_CACHE_FILE.read_text())
+        assert saved["mar-a-lago"][:2] == [26.6771, -80.037]
+
+    def test_no_result_is_negatively_cached(self, mock_geocode):
+        """A query with no results is not retried within the miss TTL."""
+        from app.location_service import _smart_geocode
+
+        mock_geocode.return_value = None
+
+        assert _smart_geocode("Nowhere XYZ") is None
+        assert _smart_geocode("Nowhere XYZ") is None
+        assert mock_geocode.call_count == 2  # US + international, once
+
+    def test_errors_are_not_cached(self, mock_geocode):
+        """A failed lookup is retried on the next call."""
+        from app.location_service import _smart_geocode
+
+        mock_geocode.side_effect = Exception("timeout")
+
+        assert _smart_geocode("Flaky Place") is None
+        assert _smart_geocode("Flaky Place") is None
+        assert mock_geocode.call_count == 4
+
+    def test_negative_cache_expires(self, mock_geocode, monkeypatch):
+        """A cached miss is retried once GEOCODE_MISS_TTL_S has elapsed."""
+        from app import location_service as ls
+
+        mock_geocode.return_value = None
+        ls._smart_geocode("Nowhere XYZ")
+
+        key = ls._clean("Nowhere XYZ")
+        ls._geocode_misses[key] -= ls.GEOCODE_MISS_TTL_S + 1
+        ls._smart_geocode("Nowhere XYZ")
+
+        assert mock_geocode.call_count == 4
+
+    def test_disambiguated_result_is_not_cached(self, mock_geocode):
+        """A pick made against nearby events is not reused for other contexts."""
+        import datetime as dt
+
+        from app import location_service as ls
+
+        picked = MagicMock(latitude=39.80, longitude=-89.64, address="Springfield, IL")
+        picked.raw = {"address": {"state": "Illinois"}, "importance": 0.6}
+        other = MagicMock(latitude=42.10, longitude=-72.59, address="Springfield, MA")
+        mock_geocode.return_value = [picked, other]
+
+        with patch(
+            "app.location_service._disambiguate_results", return_value=(picked, None)
+        ):
+            result = ls._smart_geocode(
+                "Springfield",
+                context_events=[{"lat": 39.78, "lon": -89.65}],
+                target_dt=dt.datetime.now(dt.timezone.utc),
+            )
+
+        assert result is picked
+        assert ls._geocode_cache == {}
+        assert not ls.GEOCODE_CACHE_FILE.exists()
+
+    def test_cache_is_capped_and_written_atomically(self, monkeypatch):
+        """The oldest entry is dropped at GEOCODE_CACHE_MAX; no temp file remains."""
+        from app import location_service as ls
+
+        monkeypatch.setattr(ls, "GEOCODE_CACHE_MAX", 2)
+        for name in ("Alpha", "Bravo", "Charlie"):
+            place = MagicMock(latitude=1.0, longitude=2.0, address=name, raw={})
+            ls._set_cached_geocode(name, place)
+
+        assert list(ls._geocode_cache) == ["bravo", "charlie"]
+        assert set(json.loads(ls.GEOCODE_CACHE_FILE.read_text())) == {
+            "bravo",
+            "charlie",
+        }
+        assert not ls.GEOCODE_CACHE_FILE.with_name("geocode_cache.json.tmp").exists()
+
+    async def test_async_geocode_fires_alerts_on_event_loop(self, mock_geocode):
+        """Log/alert hooks run on the loop thread, not the geocode worker."""
+        import threading
+
+        from app import location_service as ls
+
+        mock_geocode.return_value = None
+        threads = []
+
+        def _record(**_):
+            threads.append(threading.get_ident())
+
+        with (
+            patch("app.location_service.add_geocode_entry", _record),
+            patch("app.location_service.emit_geocode_failure", _record),
+        ):
+            assert await ls._smart_geocode_async("Nowhere Async XYZ") is None
+
+        assert threads == [threading.get_ident()] * 2
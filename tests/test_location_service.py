@@ -558,3 +558,130 @@ class TestHybridDisambiguation:
         assert best.latitude == self.ARIZONA_LAT
         assert alert is not None
         assert alert["type"] == "all_infeasible"
+
+
+def test_clean_normalises_and_is_memoised() -> None:
+    """_clean squashes NBSP/dashes, lower-cases, and caches repeat inputs."""
+    loc._clean.cache_clear()
+
+    assert loc._clean("  Mar–a–Lago Club ") == "mar-a-lago club"
+    assert loc._clean("  Mar–a–Lago Club ") == "mar-a-lago club"
+    assert loc._clean.cache_info().hits == 1
+    assert loc._clean("  The White House\t") == "the white house"
+
+
+@pytest.mark.asyncio
+async def test_alias_longest_match_wins(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The most specific alias wins when several keys occur in the location."""
+    monkeypatch.setattr(loc, "get_plane_state", lambda: None, raising=True)
+    monkeypatch.setattr(cal, "get_overnight_base", lambda now=None: None)
+
+    now_utc = dt.datetime.now(dt.timezone.utc)
+    monkeypatch.setattr(
+        cal,
+        "current_event",
+        lambda *_: {
+            "location": "The White House Press Briefing Room",
+            "summary": "Press briefing",
+            "dtstart_utc": now_utc,
+        },
+        raising=True,
+    )
+    loc._cached.clear()  # type: ignore[attr-defined]
+
+    coords = await loc.current_coords()
+
+    assert coords["name"] == "James S. Brady Briefing Room, WH"
+    assert coords["reason"] == "calendar_alias"
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("the white house press briefing room", "James S. Brady Briefing Room, WH"),
+        ("mar-a-lago club, palm beach", "Mar-a-Lago, FL"),
+        ("somewhere with no alias", None),
+    ],
+)
+def test_find_alias_prefers_longest_key(text: str, expected: str | None) -> None:
+    """The longest-first scan returns the most specific alias, or None."""
+    from app import place_aliases
+
+    alias = place_aliases.find_alias(text)
+
+    assert (alias["name"] if alias else None) == expected
+
+
+@pytest.mark.asyncio
+async def test_memo_single_flight_per_arguments() -> None:
+    """Concurrent misses share one call; different arguments get own slots."""
+    import asyncio
+
+    calls: list[bool] = []
+
+    @loc.memo(60)
+    async def _probe(flag: bool = False) -> bool:
+        calls.append(flag)
+        await asyncio.sleep(0)
+        return flag
+
+    loc._cached.clear()  # type: ignore[attr-defined]
+    results = await asyncio.gather(*(_probe(flag=True) for _ in range(5)))
+
+    assert results == [True] * 5
+    assert await _probe(flag=False) is False
+    assert calls == [True, False]
+
+
+@pytest.mark.asyncio
+async def test_current_coords_reuses_recent_resolve(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Trace-less calls share a resolve; trace/bypass calls always run."""
+    calls: list[int] = []
+
+    def _plane() -> None:
+        calls.append(1)
+        return None
+
+    monkeypatch.setattr(loc, "get_plane_state", _plane, raising=True)
+    monkeypatch.setattr(cal, "current_event", lambda *_: None, raising=True)
+    monkeypatch.setattr(cal, "get_overnight_base", lambda now=None: None)
+
+    async def _no_news() -> None:
+        return None
+
+    monkeypatch.setattr(loc, "get_latest_location", _no_news, raising=True)
+    monkeypatch.setattr(loc, "load_last", lambda: None, raising=True)
+
+    first = await loc.current_coords()
+    second = await loc.current_coords()
+    assert first is second
+    assert len(calls) == 1
+
+    await loc.current_coords(bypass_cache=True)
+    await loc.current_coords(trace=[])
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_unchanged_location_still_warns_on_low_confidence(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A confidence drop at the same place is reported despite the dedupe."""
+    import asyncio
+
+    warned: list[float] = []
+    monkeypatch.setattr(loc, "_is_initializing", False)
+    monkeypatch.setattr(loc, "emit_location_changed", lambda **_: None)
+    monkeypatch.setattr(
+        loc, "emit_low_confidence", lambda **kw: warned.append(kw["confidence"])
+    )
+
+    coords = {"lat": 38.9, "lon": -77.0, "reason": "calendar_alias"}
+    loc._schedule_state_change_events({**coords, "confidence": 70}, None)
+    await asyncio.sleep(0)
+    loc._schedule_state_change_events({**coords, "confidence": 30}, None)
+    await asyncio.sleep(0)
+
+    assert warned == [70, 30]
@@ -78,6 +78,14 @@ def test_broadcast_forbidden(monkeypatch: pytest.MonkeyPatch) -> None:
     assert client.post("/broadcast?msg=hi&token=bad").status_code == 403
 
 
+def test_broadcast_disabled_when_token_unset(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A blank BROADCAST_TOKEN disables admin endpoints instead of matching."""
+    client = _build_client(monkeypatch)
+    monkeypatch.setattr(main, "BROADCAST_TOKEN", "", raising=False)
+    assert client.post("/broadcast?msg=hi&token=%20").status_code == 503
+    assert client.get("/subscription_stats?token=").status_code == 503
+
+
 # ------------------------------------------------------------------ #
 # Thunderstorm Integration Tests
 # ------------------------------------------------------------------ #
@@ -139,6 +147,61 @@ def test_is_it_raining_no_thunderstorm(monkeypatch: pytest.MonkeyPatch) -> None:
     assert data["thunderstorm_state"] == "none"
 
 
+_LOOP_COORDS = {"lat": 38.9, "lon": -77.0, "name": "Loop, DC"}
+_LOOP_FLIGHT = {"lat": 30.0, "lon": -80.0, "name": "Air Force One", "in_flight": True}
+
+
+@pytest.mark.parametrize(
+    ("age_s", "coords", "precip", "fetches", "name", "mmh"),
+    [
+        (0.0, _LOOP_COORDS, {"precipitating": True, "rain": 3.0}, 0, "Loop, DC", 3.0),
+        (0.0, _LOOP_FLIGHT, None, 0, "Air Force One", 0.0),
+        (
+            main.LATEST_READING_MAX_AGE_S + 1,
+            _LOOP_COORDS,
+            {"precipitating": True, "rain": 3.0},
+            2,
+            "Somewhere, USA",
+            1.0,
+        ),
+    ],
+    ids=["fresh", "in_flight", "stale"],
+)
+def test_is_it_raining_reuses_fresh_loop_reading(
+    monkeypatch: pytest.MonkeyPatch,
+    age_s: float,
+    coords: dict[str, Any],
+    precip: dict[str, Any] | None,
+    fetches: int,
+    name: str,
+    mmh: float,
+) -> None:
+    """A recent polling-loop reading is served as-is; a stale one is refetched."""
+    calls: list[str] = []
+
+    async def _fake_coords() -> dict[str, Any]:
+        calls.append("coords")
+        return {"lat": 40.0, "lon": -75.0, "name": "Somewhere, USA"}
+
+    async def _fake_precip(lat: float, lon: float) -> dict[str, Any]:
+        calls.append("precip")
+        return {"precipitating": True, "rain": 1.0}
+
+    monkeypatch.setattr(main, "current_coords", _fake_coords, raising=True)
+    monkeypatch.setattr(main, "get_precip", _fake_precip, raising=True)
+    monkeypatch.setattr(
+        main.app.state,
+        "latest_reading",
+        (main.time.monotonic() - age_s, coords, precip),
+    )
+
+    data = TestClient(main.app).get("/is_it_raining.json").json()
+
+    assert len(calls) == fetches
+    assert data["coords"]["name"] == name
+    assert data["mmh"] == mmh
+
+
 def test_is_it_raining_in_flight_no_thunderstorm(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -270,3 +333,13 @@ def test_thunderstorm_no_notification_same_state(
     main._maybe_send_thunderstorm_notification(MockApp, precip, coords)
 
     assert len(notifications) == 0  # No notification sent
+
+
+def test_poll_interval_backs_off_only_without_subscribers() -> None:
+    """Stable readings slow polling, but never while someone is subscribed."""
+    stable = main.STABLE_CYCLES_BEFORE_BACKOFF
+
+    assert main._poll_interval(0, has_subscribers=False) == main.POLL_INTERVAL_S
+    assert main._poll_interval(stable - 1, False) == main.POLL_INTERVAL_S
+    assert main._poll_interval(stable, False) == main.POLL_INTERVAL_MAX_S
+    assert main._poll_interval(stable, True) == main.POLL_INTERVAL_S
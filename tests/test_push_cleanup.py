@@ -277,3 +277,55 @@ def test_stats_with_mixed_subscriptions(tmp_path, monkeypatch):
     assert stats["never_delivered"] == 2  # Subs 3 and 4
     assert stats["stale_never_delivered"] == 1  # Only sub 4 (>365 days, no delivery)
     assert stats["recently_active"] == 1  # Only sub 1 (delivery in last 7 days)
+
+
+def test_stats_parse_timestamps_once_per_file_version(tmp_path, monkeypatch):
+    """Repeated stats calls reuse the parsed timestamp columns."""
+    sub_file = tmp_path / "subs.json"
+    monkeypatch.setattr(push_service, "SUB_FILE", sub_file)
+
+    now = dt.datetime.now(dt.timezone.utc)
+    sub_file.write_text(
+        json.dumps(
+            [
+                {
+                    "endpoint": "https://fcm.googleapis.com/1",
+                    "keys": {},
+                    "subscription_date": (now - dt.timedelta(days=400)).isoformat(),
+                }
+            ]
+        )
+    )
+
+    parsed = []
+    real_field_epoch = push_service._field_epoch
+
+    def _counting_field_epoch(sub, field):
+        parsed.append(field)
+        return real_field_epoch(sub, field)
+
+    monkeypatch.setattr(push_service, "_field_epoch", _counting_field_epoch)
+
+    first = push_service.get_subscription_stats()
+    assert push_service.get_subscription_stats() == first
+    assert len(parsed) == 2  # subscription_date + last_delivery, once
+
+    assert push_service.cleanup_old_subscriptions(max_days=365) == 1
+    assert push_service.get_subscription_stats()["total"] == 0
+
+
+def test_timestamps_stored_with_epoch_seconds(tmp_path, monkeypatch):
+    """subscription_date carries a matching integer subscription_date_ts."""
+    sub_file = tmp_path / "subs.json"
+    monkeypatch.setattr(push_service, "SUB_FILE", sub_file)
+
+    push_service.add_subscription(
+        {
+            "endpoint": "https://fcm.googleapis.com/fcm/send/epoch",
+            "keys": {"p256dh": "abc", "auth": "def"},
+        }
+    )
+
+    (stored,) = json.loads(sub_file.read_text())
+    parsed = dt.datetime.fromisoformat(stored["subscription_date"])
+    assert stored["subscription_date_ts"] == int(parsed.timestamp())
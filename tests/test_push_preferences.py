@@ -400,3 +400,35 @@ def test_broadcast_mixed_preferences(tmp_path, monkeypatch):
     # thunderstorm_start: only sub3 (needs rain_start AND thunderstorm)
     sent = ps.broadcast("Title", "Body", notification_type="thunderstorm_start")
     assert sent == 1
+
+
+@pytest.mark.parametrize(
+    "notification_type",
+    [None, "rain_start", "rain_stop", "thunderstorm_start", "thunderstorm_end"],
+)
+def test_broadcast_buckets_match_should_notify(
+    tmp_path, monkeypatch, notification_type
+):
+    """Preference-mask buckets select exactly the subs _should_notify accepts."""
+    sub_file = tmp_path / "subs.json"
+    monkeypatch.setattr(ps, "SUB_FILE", sub_file)
+
+    spy = _SpyWebPush()
+    monkeypatch.setattr(ps, "webpush", spy)
+    monkeypatch.setattr(ps, "VAPID_PUBLIC", "dummy")
+    monkeypatch.setattr(ps, "VAPID_PRIVATE", "dummy")
+
+    names = ("rain_start", "rain_stop", "thunderstorm")
+    subs = [
+        _make_sub(i, prefs={name: bool(i >> bit & 1) for bit, name in enumerate(names)})
+        for i in range(8)
+    ]
+    subs.append(_make_sub(8))  # legacy: no preferences stored
+    sub_file.write_text(json.dumps(subs))
+
+    ps.broadcast("Title", "Body", notification_type=notification_type)
+
+    expected = {
+        s["endpoint"] for s in subs if ps._should_notify(s, notification_type)
+    }
+    assert {call["subscription_info"]["endpoint"] for call in spy} == expected
@@ -1,6 +1,7 @@
 import json
 
 import pytest
+import requests
 
 from app import push_service as ps
 
@@ -74,6 +75,22 @@ def test_validate_subscription_too_large():
     assert ps.validate_subscription(sub) is False
 
 
+def test_validate_subscription_extra_fields_size_checked():
+    """Fields beyond endpoint/keys/expirationTime still count toward the cap."""
+    sub = {
+        "endpoint": "https://example.com/push",
+        "expirationTime": None,
+        "keys": {"p256dh": "key", "auth": "test"},
+    }
+    assert ps.validate_subscription(sub) is True
+    assert ps.validate_subscription({**sub, "padding": "x" * 3000}) is False
+    assert ps.validate_subscription({**sub, "expirationTime": "x" * 3000}) is False
+    assert (
+        ps.validate_subscription({**sub, "endpoint": "https://e.x/" + "x" * 1100})
+        is False
+    )
+
+
 # ------------------------------------------------------------------ #
 # Subscription Cap Tests
 # ------------------------------------------------------------------ #
@@ -188,3 +205,130 @@ def test_broadcast_happy_path(tmp_path, monkeypatch):
     assert json.loads(sub_file.read_text())[0]["endpoint"].endswith(
         "abc"
     )  # still stored
+
+
+def test_load_index_cached_until_file_changes(tmp_path, monkeypatch):
+    """The parsed index is reused until SUB_FILE is rewritten."""
+    sub_file = tmp_path / "subs.json"
+    sub_file.write_text(json.dumps([{"endpoint": "https://fcm.example/a", "keys": {}}]))
+    monkeypatch.setattr(ps, "SUB_FILE", sub_file)
+
+    first = ps._load_index()
+    assert ps._load_index() is first
+
+    # An external rewrite (new mtime/size) is picked up
+    sub_file.write_text(
+        json.dumps(
+            [
+                {"endpoint": "https://fcm.example/a", "keys": {}},
+                {"endpoint": "https://fcm.example/b", "keys": {}},
+            ]
+        )
+    )
+    assert list(ps._load_index()) == ["https://fcm.example/a", "https://fcm.example/b"]
+
+
+def test_broadcast_keeps_subscription_added_mid_send(tmp_path, monkeypatch):
+    """A subscribe that lands while sends are in flight is not overwritten."""
+    sub_file = tmp_path / "subs.json"
+    sub_file.write_text(
+        json.dumps([{"endpoint": "https://fcm.example/old", "keys": {}}])
+    )
+    monkeypatch.setattr(ps, "SUB_FILE", sub_file)
+    monkeypatch.setattr(ps, "VAPID_PUBLIC", "dummy")
+    monkeypatch.setattr(ps, "VAPID_PRIVATE", "dummy")
+
+    def _push_then_subscribe(**_):
+        ps.add_subscription(
+            {
+                "endpoint": "https://fcm.example/new",
+                "keys": {"p256dh": "k", "auth": "a"},
+            }
+        )
+
+    monkeypatch.setattr(ps, "webpush", _push_then_subscribe)
+
+    assert ps.broadcast("Title", "Body") == 1
+    stored = {s["endpoint"]: s for s in json.loads(sub_file.read_text())}
+    assert set(stored) == {"https://fcm.example/old", "https://fcm.example/new"}
+    assert "last_delivery" in stored["https://fcm.example/old"]
+
+
+def test_broadcast_network_error_is_transient(tmp_path, monkeypatch):
+    """A timed-out push neither aborts the broadcast nor drops the sub."""
+    sub_file = tmp_path / "subs.json"
+    endpoints = [f"https://fcm.example/{name}" for name in ("ok", "slow", "gone")]
+    sub_file.write_text(json.dumps([{"endpoint": ep, "keys": {}} for ep in endpoints]))
+    monkeypatch.setattr(ps, "SUB_FILE", sub_file)
+    monkeypatch.setattr(ps, "VAPID_PUBLIC", "dummy")
+    monkeypatch.setattr(ps, "VAPID_PRIVATE", "dummy")
+
+    def _webpush(subscription_info, **_):
+        if subscription_info["endpoint"].endswith("slow"):
+            raise requests.Timeout("read timed out")
+        if subscription_info["endpoint"].endswith("gone"):
+            raise ps.WebPushException("410 Gone")
+
+    monkeypatch.setattr(ps, "webpush", _webpush)
+
+    assert ps.broadcast("Title", "Body") == 1
+    stored = {s["endpoint"]: s for s in json.loads(sub_file.read_text())}
+    assert set(stored) == {"https://fcm.example/ok", "https://fcm.example/slow"}
+    assert "last_delivery" in stored["https://fcm.example/ok"]
+    assert "last_delivery" not in stored["https://fcm.example/slow"]
+
+
+def test_broadcast_signs_vapid_once_per_audience(tmp_path, monkeypatch):
+    """One JWT per push host, reused as headers for every send to it."""
+    sub_file = tmp_path / "subs.json"
+    sub_file.write_text(
+        json.dumps(
+            [
+                {"endpoint": f"https://fcm.googleapis.com/{i}", "keys": {}}
+                for i in range(3)
+            ]
+        )
+    )
+    monkeypatch.setattr(ps, "SUB_FILE", sub_file)
+    monkeypatch.setattr(ps, "VAPID_PUBLIC", "pub")
+    monkeypatch.setattr(ps, "VAPID_PRIVATE", "priv")
+
+    signed = []
+
+    class _FakeVapid:
+        @classmethod
+        def from_string(cls, private_key):
+            return cls()
+
+        def sign(self, claims):
+            signed.append(claims["aud"])
+            return {"Authorization": f"vapid t={claims['aud']}"}
+
+    monkeypatch.setattr(ps, "Vapid", _FakeVapid)
+    spy = _SpyWebPush()
+    monkeypatch.setattr(ps, "webpush", spy)
+
+    assert ps.broadcast("Title", "Body") == 3
+    assert signed == ["https://fcm.googleapis.com"]
+    assert all("vapid_private_key" not in call for call in spy)
+    assert {call["headers"]["Authorization"] for call in spy} == {
+        "vapid t=https://fcm.googleapis.com"
+    }
+
+
+def test_sub_file_written_compact_unless_pretty(tmp_path, monkeypatch):
+    """SUB_FILE is compact JSON by default and indented with PUSH_PRETTY."""
+    sub_file = tmp_path / "subs.json"
+    monkeypatch.setattr(ps, "SUB_FILE", sub_file)
+    sub = {
+        "endpoint": "https://fcm.googleapis.com/fcm/send/compact",
+        "keys": {"p256dh": "key", "auth": "auth"},
+    }
+
+    ps.add_subscription(dict(sub))
+    assert "\n" not in sub_file.read_text()
+
+    monkeypatch.setattr(ps, "PUSH_PRETTY", True)
+    ps.add_subscription(dict(sub))
+    assert sub_file.read_text().startswith("[\n  {")
+    assert json.loads(sub_file.read_text())[0]["endpoint"] == sub["endpoint"]
@@ -15,7 +15,7 @@ from app import snapshot_service as ss
 @pytest.fixture
 def snapshot_dir(tmp_path, monkeypatch):
     """Redirect snapshot storage to temp directory."""
-    snapshot_file = tmp_path / "debug_history.json"
+    snapshot_file = tmp_path / "debug_history.jsonl"
     monkeypatch.setattr(ss, "DIR", tmp_path)
     monkeypatch.setattr(ss, "FILE", snapshot_file)
     return tmp_path
@@ -113,9 +113,23 @@ def test_add_snapshot_creates_file(snapshot_dir, sample_coords, sample_precip):
     ss.add_snapshot(coords=sample_coords, precip=sample_precip)
 
     assert ss.FILE.exists()
-    data = json.loads(ss.FILE.read_text())
-    assert len(data["snapshots"]) == 1
-    assert data["snapshots"][0]["coords"]["name"] == "Palm Beach"
+    lines = ss.FILE.read_text().splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["coords"]["name"] == "Palm Beach"
+
+
+def test_add_snapshot_stores_epoch_with_iso_ts(
+    snapshot_dir, sample_coords, sample_precip
+):
+    """Each snapshot carries integer epoch seconds matching its ISO ts."""
+    now = dt.datetime(2025, 6, 1, 12, 30, 15, 500000, tzinfo=dt.timezone.utc)
+    ss.add_snapshot(coords=sample_coords, precip=sample_precip, now=now)
+
+    (snap,) = ss._load_snapshots()
+    assert snap["ts"] == now.isoformat()
+    assert snap["epoch"] == int(now.timestamp())
+    assert ss._snapshot_epoch(snap) == snap["epoch"]
+    assert ss._snapshot_epoch({"ts": snap["ts"]}) == now.timestamp()
 
 
 def test_add_snapshot_appends_to_existing(snapshot_dir, sample_coords, sample_precip):
@@ -223,6 +237,28 @@ def test_get_snapshot_stats_with_data(snapshot_dir, sample_coords, sample_precip
     assert stats["max_age_hours"] == ss.SNAPSHOT_MAX_AGE_H
 
 
+def test_get_snapshot_stats_cached_until_save(
+    snapshot_dir, monkeypatch, sample_coords, sample_precip
+):
+    """Stats are computed once per store version and refreshed on save."""
+    ss.add_snapshot(coords=sample_coords, precip=sample_precip)
+    calls = []
+    real_load = ss._load_snapshots
+
+    def _counting_load():
+        calls.append(1)
+        return real_load()
+
+    monkeypatch.setattr(ss, "_load_snapshots", _counting_load)
+
+    assert ss.get_snapshot_stats()["count"] == 1
+    assert ss.get_snapshot_stats()["count"] == 1
+    assert len(calls) == 1
+
+    ss.add_snapshot(coords=sample_coords, precip=sample_precip)
+    assert ss.get_snapshot_stats()["count"] == 2
+
+
 def test_snapshot_auto_prunes_old(snapshot_dir, monkeypatch, sample_coords, sample_precip):
     """add_snapshot automatically prunes old entries."""
     monkeypatch.setattr(ss, "SNAPSHOT_MAX_AGE_H", 1)  # 1 hour max age
@@ -243,3 +279,36 @@ def test_snapshot_auto_prunes_old(snapshot_dir, monkeypatch, sample_coords, samp
     snapshots = ss._load_snapshots()
     assert len(snapshots) == 1
     assert snapshots[0]["coords"]["name"] == "Palm Beach"  # Only new one remains
+
+
+def test_get_snapshots_limit_reads_tail(snapshot_dir, monkeypatch, sample_precip):
+    """A plain limit is served from the end of the file, newest first."""
+    monkeypatch.setattr(ss, "_TAIL_BLOCK", 16)  # force several backward reads
+    for i in range(10):
+        ss.add_snapshot(coords={"name": f"Location {i}"}, precip=sample_precip)
+
+    def _no_full_load():
+        raise AssertionError("full history load")
+
+    monkeypatch.setattr(ss, "_load_snapshots", _no_full_load)
+    names = [snap["coords"]["name"] for snap in ss.get_snapshots(limit=3)]
+    assert names == ["Location 9", "Location 8", "Location 7"]
+
+
+def test_get_snapshots_orders_mixed_offsets_by_instant(snapshot_dir):
+    """Sorting and the since_hours cutoff agree when ts offsets differ."""
+    now = dt.datetime.now(dt.timezone.utc)
+    est = dt.timezone(dt.timedelta(hours=-5))
+    older = {"ts": (now - dt.timedelta(hours=2)).isoformat(), "coords": {"name": "A"}}
+    # Written later and one hour newer, but its -05:00 string sorts first
+    newer = {
+        "ts": (now - dt.timedelta(hours=1)).astimezone(est).isoformat(),
+        "coords": {"name": "B"},
+    }
+    ss.FILE.write_bytes(ss._encode(older) + ss._encode(newer))
+
+    assert [s["coords"]["name"] for s in ss.get_snapshots(since_hours=3)] == [
+        "B",
+        "A",
+    ]
+    assert [s["coords"]["name"] for s in ss.get_snapshots(since_hours=1.5)] == ["B"]
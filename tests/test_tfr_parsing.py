@@ -6,6 +6,8 @@ Test TFR coordinate parsing with validation.
 
 from __future__ import annotations
 
+import json
+
 import pytest
 from app.location_service import parse_tfr_coordinates
 
@@ -103,3 +105,62 @@ def test_parse_malformed_format():
 
     # Non-numeric values
     assert parse_tfr_coordinates("NABC, WDEF") is None
+
+
+def test_near_tfr_matches_haversine_radius():
+    """Unit-vector proximity test agrees with the 55 km haversine cut-off."""
+    from app.location_service import _haversine_km, _near_tfr
+
+    recs = [{"_latlon": {"lat": 26.6770, "lon": -80.0370}}]  # Mar-a-Lago
+
+    # ~11 km away → near; ~110 km away → not near
+    assert _near_tfr(26.7770, -80.0370, recs) is True
+    assert _near_tfr(27.6770, -80.0370, recs) is False
+    assert _haversine_km(26.6770, -80.0370, 27.6770, -80.0370) > 55
+    assert _near_tfr(26.7770, -80.0370, []) is False
+
+
+def test_tfr_vectors_cached_per_record_list():
+    """Unit vectors are built once per `_vip_json` result list."""
+    from app.location_service import _tfr_vectors
+
+    recs = [{"_latlon": {"lat": 40.7128, "lon": -74.0060}}]
+    vectors = _tfr_vectors(recs)
+
+    assert len(vectors) == 1
+    assert _tfr_vectors(recs) is vectors
+    assert _tfr_vectors(list(recs)) is not vectors
+
+
+async def test_vip_json_attaches_parsed_centre(monkeypatch):
+    """_vip_json parses each centre once and drops records without one."""
+    import datetime as dt
+
+    from app import location_service as loc
+
+    now = dt.datetime.now(dt.timezone.utc)
+    window = {
+        "effectiveBegin": (now - dt.timedelta(hours=1)).isoformat(),
+        "effectiveEnd": (now + dt.timedelta(hours=1)).isoformat(),
+    }
+    payload = [
+        {"type": "VIP", "description": "VIP N40.7128, W74.0060", **window},
+        {"type": "VIP", "description": "VIP TFR without coordinates", **window},
+    ]
+
+    class _Resp:
+        content = json.dumps(payload).encode()
+
+    async def _fake_request(*_a, **_kw):
+        return _Resp()
+
+    monkeypatch.setattr(loc, "TFR_ENABLED", True)
+    monkeypatch.setattr(loc, "logged_request_async", _fake_request)
+
+    recs = await loc._vip_json.__wrapped__()
+
+    assert len(recs) == 1
+    assert recs[0]["_latlon"] == {
+        "lat": pytest.approx(40.7128),
+        "lon": pytest.approx(-74.0060),
+    }
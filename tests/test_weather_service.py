@@ -1,6 +1,8 @@
 # tests/test_weather_service.py
 
 import datetime as dt
+import json
+
 import pytest
 
 from app import weather_service as ws
@@ -9,12 +11,17 @@ from app import weather_service as ws
 @pytest.fixture(autouse=True)
 def _clear_cache():
     # clear the per-function memo cache before and after each test
+    # and drop the shared client so each test builds one from its dummy
     ws.get_precip.cache_clear()
+    ws._HTTP_CLIENT = None
     yield
     ws.get_precip.cache_clear()
+    ws._HTTP_CLIENT = None
 
 
 class _DummyAsyncClient:
+    is_closed = False
+
     def __init__(self, payload):
         self._payload = payload
 
@@ -29,14 +36,47 @@ class _DummyAsyncClient:
             status_code = 200
 
             def __init__(self, payload):
-                self._payload = payload
-
-            def json(self):
-                return self._payload
+                self.content = json.dumps(payload).encode()
 
         return _Resp(self._payload)
 
 
+def _hourly_payload(rain=0.0):
+    """A valid Open-Meteo payload with one entry for the current UTC hour."""
+    now_hour = dt.datetime.now(dt.timezone.utc).replace(
+        minute=0, second=0, microsecond=0
+    )
+    return {
+        "hourly": {
+            "time": [now_hour.strftime("%Y-%m-%dT%H:%M")],
+            "rain": [rain],
+            "snowfall": [0.0],
+            "weather_code": [0],
+        }
+    }
+
+
+
+@pytest.fixture
+def counting_client(monkeypatch):
+    """Install ``base(*args)`` as the HTTP client; return its list of requests.
+
+    Usage: ``calls = counting_client(_DummyAsyncClient, payload)``.
+    """
+    calls = []
+
+    def _install(base, *args):
+        class _Client(base):
+            async def get(self, *get_args):
+                calls.append(get_args)
+                return await super().get(*get_args)
+
+        monkeypatch.setattr(ws.httpx, "AsyncClient", lambda *_, **__: _Client(*args))
+        return calls
+
+    return _install
+
+
 @pytest.mark.parametrize("rain,expect_rain", [(0.0, False), (1.2, True)])
 @pytest.mark.asyncio
 async def test_get_precip(monkeypatch, rain, expect_rain):
@@ -135,6 +175,8 @@ async def test_get_precip_both(monkeypatch):
 class _ErrorAsyncClient:
     """Mock client that returns error responses."""
 
+    is_closed = False
+
     def __init__(self, status_code, payload=None):
         self._status_code = status_code
         self._payload = payload or {}
@@ -149,10 +191,7 @@ class _ErrorAsyncClient:
         class _Resp:
             def __init__(self, status_code, payload):
                 self.status_code = status_code
-                self._payload = payload
-
-            def json(self):
-                return self._payload
+                self.content = json.dumps(payload).encode()
 
         return _Resp(self._status_code, self._payload)
 
@@ -218,6 +257,24 @@ async def test_get_precip_malformed_json(monkeypatch):
     assert res.get("precipitating") is None
 
 
+@pytest.mark.asyncio
+async def test_get_precip_invalid_json_body(monkeypatch):
+    """A 200 whose body is not JSON is reported as a parse error."""
+
+    class _Client(_DummyAsyncClient):
+        async def get(self, *_):
+            resp = await super().get()
+            resp.content = b"<html>upstream hiccup</html>"
+            return resp
+
+    monkeypatch.setattr(ws.httpx, "AsyncClient", lambda *_, **__: _Client({}))
+
+    res = await ws.get_precip(40.0, -70.0)
+    assert res.get("error") is True
+    assert res["reason"].startswith("Failed to parse JSON response")
+    assert res.get("precipitating") is None
+
+
 # ── Thunderstorm Detection Tests ─────────────────────────────────────
 
 
@@ -443,3 +500,80 @@ async def test_get_precip_with_timezone_offset(monkeypatch):
     assert res["rain"] == 2.5
     assert res["sunrise"] == "2025-12-05T07:00"
     assert res["sunset"] == "2025-12-05T17:00"
+
+
+@pytest.mark.asyncio
+async def test_get_precip_cache_rounds_coordinates(counting_client):
+    """Coordinates equal to 2 decimals share one cached fetch."""
+    calls = counting_client(_DummyAsyncClient, _hourly_payload())
+
+    await ws.get_precip(40.001, -70.002)
+    await ws.get_precip(40.0012, -70.0024)
+    assert len(calls) == 1
+
+    await ws.get_precip(40.1, -70.0)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_precip_trace_bypasses_cache(counting_client):
+    """Plain calls return a dict; traced calls return a fresh (dict, trace)."""
+    calls = counting_client(_DummyAsyncClient, _hourly_payload())
+
+    plain = await ws.get_precip(40.0, -70.0)
+    assert isinstance(plain, dict)
+    assert "error" not in plain
+
+    res, trace = await ws.get_precip_with_trace(40.0, -70.0)
+    assert res == plain and res is not plain
+    assert trace[0]["step"] == "start"
+    assert len(calls) == 2
+
+    # The traced call neither read nor replaced the cached dict
+    assert await ws.get_precip(40.0, -70.0) is plain
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_precip_errors_are_not_cached(counting_client):
+    """An upstream error is returned but the next call fetches again."""
+    calls = counting_client(_ErrorAsyncClient, 503)
+
+    assert (await ws.get_precip(40.0, -70.0))["error"] is True
+    assert (await ws.get_precip(40.0, -70.0))["error"] is True
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_precip_concurrent_misses_share_one_fetch(counting_client):
+    """Concurrent callers in one grid cell await a single upstream request."""
+    import asyncio
+
+    calls = counting_client(_DummyAsyncClient, _hourly_payload())
+
+    results = await asyncio.gather(
+        ws.get_precip(40.001, -70.002),
+        ws.get_precip(40.0012, -70.0024),
+        ws.get_precip(40.001, -70.002),
+    )
+    assert len(calls) == 1
+    assert results[0] is results[1] is results[2]
+
+
+@pytest.mark.asyncio
+async def test_memo_evicts_oldest_entry_when_full():
+    """The memo cache is bounded: the oldest entry goes once maxsize is hit."""
+    calls = []
+
+    @ws.memo(300, maxsize=2)
+    async def _square(x):
+        calls.append(x)
+        return x * x
+
+    assert [await _square(n) for n in (1, 2, 3)] == [1, 4, 9]
+    await _square(3)
+    await _square(2)
+    assert calls == [1, 2, 3]
+
+    await _square(1)  # evicted by 3, fetched again
+    assert calls == [1, 2, 3, 1]